@@ -0,0 +1,22 @@
+from .abstract_command import AbstractCommand
+
+
+class ReplayRecords(AbstractCommand):
+    def get_name(self):
+        return "replay"
+
+    def get_description(self):
+        return "Send records written with output_path to the index"
+
+    def get_usage(self):
+        return super(ReplayRecords, self).get_usage() + " config path"
+
+    def get_options(self):
+        return [{"name": "config", "description": "path to the config of the index"},
+                {"name": "path", "description": "output_path directory or records file"}]
+
+    def run(self, args):
+        from scraper.src.index import replay_records
+
+        self.check_not_docsearch_app_id("replay records manually")
+        return replay_records(args[0], args[1])
@@ -16,6 +16,7 @@ from .commands.playground_config import PlaygroundConfig
 from .commands.build_docker_scraper import BuildDockerScraper
 from .commands.run_tests import RunTests
 from .commands.run_config import RunConfig
+from .commands.replay_records import ReplayRecords
 from .commands.deploy_docker_scraper_images import DeployDockerScraperImages
 from .commands.deploy_config import DeployConfig
 from .commands.run_config_docker import RunConfigDocker
@@ -63,6 +64,7 @@ cmds.append(PlaygroundConfig())
 
 if CREDENTIALS:
     cmds.append(RunConfig())
+    cmds.append(ReplayRecords())
     cmds.append(RunConfigDocker())
 
 if ADMIN:
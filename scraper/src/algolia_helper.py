@@ -3,16 +3,28 @@ Wrapper on top of the AlgoliaSearch API client"""
 
 from algoliasearch.search_client import SearchClient
 
-from builtins import range
+from .output_sink import AlgoliaSink
 
 
 class AlgoliaHelper:
     """AlgoliaHelper"""
 
-    def __init__(self, app_id, api_key, index_name, index_name_tmp, settings, query_rules, clear_index):
-        self.algolia_client = SearchClient.create(app_id, api_key)
+    def __init__(self, app_id, api_key, index_name, index_name_tmp, settings, query_rules, clear_index,
+                 batch_size=1000, batch_max_bytes=5000000, batch_flush_interval=5, batch_concurrency=4,
+                 record_hash_store=None, delete_vanished_records=True, batch_gzip=True,
+                 output_sink=None):
         self.index_name = index_name
         self.index_name_tmp = index_name_tmp
+
+        if output_sink is not None:
+            """Records are only written to the sink, Algolia is never called"""
+            self.algolia_client = None
+            self.clear_index = clear_index
+            self.record_hash_store = None
+            self.output_sink = output_sink
+            return
+
+        self.algolia_client = SearchClient.create(app_id, api_key)
         self.algolia_index = self.algolia_client.init_index(self.index_name)
 
 
@@ -21,6 +33,11 @@ class AlgoliaHelper:
 
         self.clear_index = clear_index
 
+        # Only meaningful when the temporary index starts as a copy of the
+        # current one: unchanged records are then already in it
+        self.record_hash_store = None if clear_index else record_hash_store
+        self.delete_vanished_records = delete_vanished_records
+
         if self.clear_index:
             """Initialize the tmp-index empty"""
             self.algolia_client.copy_rules(
@@ -34,13 +51,27 @@ class AlgoliaHelper:
             """Initialize the tmp-index with an copy of curr index content"""
             self.algolia_client.copy_index(index_name, index_name_tmp)
 
+        # Records of every page are sent together, in the background, each
+        # one serialized once
+        self.output_sink = AlgoliaSink(self.algolia_index_tmp, batch_size,
+                                       batch_max_bytes, batch_flush_interval,
+                                       batch_concurrency, batch_gzip)
+
+    def uses_algolia(self):
+        """False when the records are only written to local files"""
+        return self.algolia_client is not None
 
     def add_records(self, records, url, from_sitemap):
-        """Add new records to the temporary index"""
-        record_count = len(records)
+        """
+        Add new records to the temporary index, records can be any iterable.
+        Return the number of records.
+        """
+        record_count = 0
 
-        for i in range(0, record_count, 50):
-            self.algolia_index_tmp.save_objects(records[i:i + 50])
+        for record in records:
+            record_count += 1
+            if self.record_hash_store is None or self.record_hash_store.has_changed(record):
+                self.output_sink.add(record)
 
         color = "96" if from_sitemap else "94"
 
@@ -48,11 +79,17 @@ class AlgoliaHelper:
             '\033[{}m> DocSearch: \033[0m{}\033[93m {} records\033[0m)'.format(
                 color, url, record_count))
 
+        return record_count
+
     def add_synonyms(self, synonyms):
         synonyms_list = []
         for _, value in list(synonyms.items()):
             synonyms_list.append(value)
 
+        if not self.uses_algolia():
+            print('Synonyms are not written to the output files')
+            return
+
         self.algolia_index_tmp.save_synonyms(synonyms_list)
         print(
             '\033[94m> DocSearch: \033[0m Synonyms (\033[93m{} synonyms\033[0m)'.format(
@@ -60,6 +97,19 @@ class AlgoliaHelper:
 
     def commit_tmp_index(self):
         """Clear index (if needed) after all scraping to prevent search break on production"""
+        # Every record has to be in the temporary index before moving it
+        self.output_sink.close()
+
+        if not self.uses_algolia():
+            print('Records written to ' + self.output_sink.get_report())
+            return
+
+        if self.record_hash_store is not None and self.delete_vanished_records:
+            vanished_object_ids = self.record_hash_store.get_vanished_object_ids()
+            if len(vanished_object_ids) > 0:
+                self.algolia_index_tmp.delete_objects(vanished_object_ids)
+            self.record_hash_store.forget_vanished()
+
         if self.clear_index:
             try:
                 print("Cleaning index")
@@ -71,3 +121,7 @@ class AlgoliaHelper:
                 print("Couldn't clear index records")
         """Overwrite the real index with the temporary one"""
         self.algolia_client.move_index(self.index_name_tmp, self.index_name)
+
+        if self.record_hash_store is not None:
+            self.record_hash_store.save()
+            print('Records: ' + self.record_hash_store.get_report())
@@ -0,0 +1,104 @@
+"""BatchSerializer
+Serialize every record sent to Algolia once, with orjson or ujson when they are
+installed, and send the batches gzipped"""
+
+import gzip
+import json
+
+from algoliasearch.helpers import endpoint
+from algoliasearch.http.request_options import RequestOptions
+from algoliasearch.http.serializer import QueryParametersSerializer
+from algoliasearch.http.transporter import Request
+from algoliasearch.http.verb import Verb
+
+from .strategies.record import Record
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Same trade-off between speed and size as zlib by default
+GZIP_LEVEL = 6
+
+
+def _dumps_json(data):
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _dumps_ujson(data):
+    return ujson.dumps(data, ensure_ascii=False,
+                       escape_forward_slashes=False).encode('utf-8')
+
+
+ENCODERS = {'json': _dumps_json}
+if ujson is not None:
+    ENCODERS['ujson'] = _dumps_ujson
+if orjson is not None:
+    ENCODERS['orjson'] = orjson.dumps
+
+
+class BatchSerializer:
+    """
+    Records are serialized once, when added to a batch, as the request of
+    the batch endpoint that saves them. A batch is the concatenation of its
+    records, sent as is (gzipped by default) through the transporter of the
+    algoliasearch client, with the same hosts, retries and timeouts as
+    save_objects.
+    """
+
+    def __init__(self, encoder=None, compress=True):
+        if encoder is None:
+            encoder = 'orjson' if 'orjson' in ENCODERS else \
+                'ujson' if 'ujson' in ENCODERS else 'json'
+        self.encoder = encoder
+        self.dumps = ENCODERS[encoder]
+        self.compress = compress
+
+    def serialize(self, record):
+        """Return the record as JSON bytes"""
+        record = Record.as_dict(record)
+        try:
+            return self.dumps(record)
+        except (TypeError, ValueError, OverflowError):
+            # Ex. integers or strings the accelerated encoders don't handle
+            return _dumps_json(record)
+
+    def serialize_record(self, record):
+        """Return the request saving the record, as JSON bytes"""
+        return b'{"action":"updateObject","body":' + self.serialize(
+            record) + b'}'
+
+    def get_batch_body(self, serialized_records):
+        body = b'{"requests":[' + b','.join(serialized_records) + b']}'
+        if self.compress:
+            return gzip.compress(body, GZIP_LEVEL)
+        return body
+
+    def send_batch(self, index, serialized_records):
+        """Send the serialized records to the batch endpoint of the index"""
+        config = index._config
+        request_options = RequestOptions.create(config)
+
+        headers = dict(request_options.headers)
+        if self.compress:
+            headers['Content-Encoding'] = 'gzip'
+
+        request = Request(Verb.POST, headers, None, config.connect_timeout,
+                          request_options.timeouts['writeTimeout'],
+                          config.proxies)
+        # Sent by the requester as is
+        request.data_as_string = self.get_batch_body(serialized_records)
+
+        relative_url = '{}?{}'.format(
+            endpoint('1/indexes/{}/batch', index.name),
+            QueryParametersSerializer.serialize(
+                dict(request_options.query_parameters)))
+
+        return index._transporter.retry(config.hosts.write(), request,
+                                        relative_url)
@@ -0,0 +1,166 @@
+"""BatchWriter
+Buffer records across pages and send them by batches from background threads"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+import json
+import threading
+import time
+
+from .strategies.record import Record
+
+
+class BatchWriter:
+    """
+    Records are buffered until the batch reaches batch_size records,
+    batch_max_bytes bytes or has been waiting for flush_interval seconds.
+    Batches are sent by `concurrency` threads; adding records blocks when too
+    many batches are waiting to be sent.
+    Records are kept as they are added (Ex. Record) and only converted to
+    dicts when their batch is sent. With serialize, records are serialized
+    once, when added, and their batch is sent as a list of bytes.
+    """
+
+    def __init__(self, send_batch, batch_size=1000, batch_max_bytes=5000000,
+                 flush_interval=5, concurrency=4, serialize=None):
+        self.send_batch = send_batch
+        self.serialize = serialize
+        self.batch_size = batch_size
+        self.batch_max_bytes = batch_max_bytes
+        self.flush_interval = flush_interval
+
+        self.lock = threading.Lock()
+        self.batch = []
+        self.batch_bytes = 0
+        self.batch_started_at = None
+
+        self.executor = ThreadPoolExecutor(concurrency)
+        self.queued_batches = threading.BoundedSemaphore(concurrency * 2)
+        self.futures = set()
+        self.errors = []
+        # Batches taken from the buffer whose future isn't registered yet
+        # (Ex. waiting for a slot), drain waits for them too
+        self.nb_pending = 0
+        self.pending_submitted = threading.Condition(self.lock)
+
+        self.closed = threading.Event()
+        self.flusher = None
+        if self.flush_interval > 0:
+            self.flusher = threading.Thread(target=self._flush_periodically)
+            self.flusher.daemon = True
+            self.flusher.start()
+
+    def add(self, record):
+        if self.serialize is not None:
+            record = self.serialize(record)
+            record_bytes = len(record)
+        else:
+            record_bytes = len(json.dumps(Record.as_dict(record)))
+
+        with self.lock:
+            if len(self.batch) == 0:
+                self.batch_started_at = time.time()
+            self.batch.append(record)
+            self.batch_bytes += record_bytes
+
+            full = len(self.batch) >= self.batch_size or \
+                self.batch_bytes >= self.batch_max_bytes
+            batch = self._take_batch() if full else None
+
+        if batch is not None:
+            self._submit(batch)
+
+    def flush(self):
+        """Send the buffered records now"""
+        with self.lock:
+            batch = self._take_batch()
+
+        if batch is not None:
+            self._submit(batch)
+
+    def drain(self):
+        """Send the buffered records and wait for every batch to be sent"""
+        self.flush()
+        with self.lock:
+            self.pending_submitted.wait_for(lambda: self.nb_pending == 0)
+            futures = list(self.futures)
+        wait(futures)
+
+        self._raise_errors()
+
+    def close(self):
+        """Stop the flusher and wait for every record to be sent"""
+        self.closed.set()
+        if self.flusher is not None:
+            # Its last batch is submitted before draining
+            self.flusher.join()
+
+        try:
+            self.drain()
+        finally:
+            self.executor.shutdown()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        with self.lock:
+            errors = self.errors
+            self.errors = []
+
+        if len(errors) > 0:
+            raise errors[0]
+
+    def _take_batch(self):
+        if len(self.batch) == 0:
+            return None
+
+        batch = self.batch
+        self.batch = []
+        self.batch_bytes = 0
+        self.batch_started_at = None
+        self.nb_pending += 1
+
+        return batch
+
+    def _submit(self, batch):
+        # Back pressure: wait for a slot if the senders are behind
+        self.queued_batches.acquire()
+        try:
+            future = self.executor.submit(self._send, batch)
+        except Exception:
+            self.queued_batches.release()
+            with self.lock:
+                self.nb_pending -= 1
+                self.pending_submitted.notify_all()
+            raise
+
+        with self.lock:
+            self.futures.add(future)
+            self.nb_pending -= 1
+            self.pending_submitted.notify_all()
+        future.add_done_callback(self._forget)
+
+    def _forget(self, future):
+        with self.lock:
+            self.futures.discard(future)
+
+    def _send(self, batch):
+        try:
+            if self.serialize is None:
+                batch = [Record.as_dict(record) for record in batch]
+            self.send_batch(batch)
+        except Exception as e:
+            with self.lock:
+                self.errors.append(e)
+            print('\033[91m> DocSearch: \033[0mCouldn\'t send {} records ({})'.format(
+                len(batch), e))
+        finally:
+            self.queued_batches.release()
+
+    def _flush_periodically(self):
+        while not self.closed.wait(min(self.flush_interval, 1)):
+            with self.lock:
+                expired = self.batch_started_at is not None and \
+                    time.time() - self.batch_started_at >= self.flush_interval
+                batch = self._take_batch() if expired else None
+
+            if batch is not None:
+                self._submit(batch)
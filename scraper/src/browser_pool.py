@@ -0,0 +1,35 @@
+"""
+BrowserPool
+Hand out the headless browsers rendering the pages, one page at a time per
+browser
+"""
+
+from contextlib import contextmanager
+from queue import Queue
+
+
+class BrowserPool:
+    """BrowserPool"""
+
+    def __init__(self, drivers):
+        self.drivers = list(drivers)
+        self.idle_drivers = Queue()
+        for driver in self.drivers:
+            self.idle_drivers.put(driver)
+
+    def __len__(self):
+        return len(self.drivers)
+
+    @contextmanager
+    def browser(self):
+        """Borrow an idle browser, waiting for one if they are all busy"""
+        driver = self.idle_drivers.get()
+        try:
+            yield driver
+        finally:
+            self.idle_drivers.put(driver)
+
+    def close(self):
+        for driver in self.drivers:
+            driver.quit()
+        self.drivers = []
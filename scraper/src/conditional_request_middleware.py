@@ -0,0 +1,40 @@
+"""
+ConditionalRequestMiddleware
+"""
+
+
+class ConditionalRequestMiddleware:
+    """
+    Ask the server to only send pages that changed since the previous crawl
+    (If-None-Match / If-Modified-Since), and answer a 304 Not Modified with the
+    page kept in the validator cache
+    """
+    validator_cache = None
+
+    def __init__(self):
+        self.validator_cache = ConditionalRequestMiddleware.validator_cache
+
+    def process_request(self, request, spider):
+        if self.validator_cache is None or spider.js_render:
+            return None
+
+        validators = self.validator_cache.get_validators(request)
+        if validators is None:
+            return None
+
+        etag, last_modified = validators
+        if etag is not None:
+            request.headers.setdefault('If-None-Match', etag)
+        if last_modified is not None:
+            request.headers.setdefault('If-Modified-Since', last_modified)
+
+        return None
+
+    def process_response(self, request, response, spider):
+        if self.validator_cache is None or response.status != 304:
+            return response
+
+        cached_response = self.validator_cache.get_cached_response(request,
+                                                                   response)
+
+        return cached_response if cached_response is not None else response
@@ -3,6 +3,7 @@ import os
 from selenium import webdriver
 
 from selenium.webdriver.chrome.options import Options
+from ..browser_pool import BrowserPool
 from ..custom_downloader_middleware import CustomDownloaderMiddleware
 from ..js_executor import JsExecutor
 
@@ -15,30 +16,43 @@ class BrowserHandler:
 
         return len(results) > 0 or js_render
 
+    @staticmethod
+    def create_driver(user_agent):
+        chrome_options = Options()
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('user-agent={0}'.format(user_agent))
+
+        CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH',
+                                           "/usr/bin/chromedriver")
+        if not os.path.isfile(CHROMEDRIVER_PATH):
+            raise Exception(
+                "Env CHROMEDRIVER_PATH='{}' is not a path to a file".format(
+                    CHROMEDRIVER_PATH))
+        return webdriver.Chrome(
+            CHROMEDRIVER_PATH,
+            options=chrome_options)
+
     @staticmethod
     def init(config_original_content, js_render, user_agent):
         driver = None
 
         if BrowserHandler.conf_need_browser(config_original_content,
                                             js_render):
-            chrome_options = Options()
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('user-agent={0}'.format(user_agent))
-
-            CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH',
-                                               "/usr/bin/chromedriver")
-            if not os.path.isfile(CHROMEDRIVER_PATH):
-                raise Exception(
-                    "Env CHROMEDRIVER_PATH='{}' is not a path to a file".format(
-                        CHROMEDRIVER_PATH))
-            driver = webdriver.Chrome(
-                CHROMEDRIVER_PATH,
-                options=chrome_options)
-            CustomDownloaderMiddleware.driver = driver
+            driver = BrowserHandler.create_driver(user_agent)
             JsExecutor.driver = driver
         return driver
 
+    @staticmethod
+    def init_pool(driver, size, user_agent):
+        """Pool of `size` browsers rendering the pages, starting with driver"""
+        drivers = [driver] + [BrowserHandler.create_driver(user_agent) for _ in
+                              range(size - 1)]
+        browser_pool = BrowserPool(drivers)
+        CustomDownloaderMiddleware.browser_pool = browser_pool
+
+        return browser_pool
+
     @staticmethod
     def destroy(driver):
         # Start browser if needed
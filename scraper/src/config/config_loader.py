@@ -14,8 +14,11 @@ import copy
 from .config_validator import ConfigValidator
 from .nb_hits_updater import NbHitsUpdater
 from .urls_parser import UrlsParser
+from .start_urls_matcher import StartUrlsMatcher
 from .selectors_parser import SelectorsParser
 from .browser_handler import BrowserHandler
+from ..page_ready import PageReady
+from ..js_executor import JsExecutor
 
 
 class ConfigLoader:
@@ -32,6 +35,10 @@ class ConfigLoader:
     index_name = None
     index_name_tmp = None
     js_wait = 0
+    # Wait for a condition (selector, network_idle or script) rather than
+    # js_wait seconds, for at most js_wait_timeout seconds
+    js_wait_for = None
+    js_wait_timeout = 10
     js_render = False
     keep_tags = []
     min_indexed_level = 0
@@ -40,7 +47,14 @@ class ConfigLoader:
     scrape_start_urls = True
     selectors = None
     selectors_exclude = []
+    # Union XPath of selectors_exclude, built once
+    selectors_exclude_xpath = ''
+    # 'remove' the excluded elements from the DOM or 'skip' them
+    selectors_exclude_mode = 'remove'
     start_urls = []
+    start_urls_matcher = None
+    # Number of page URLs whose matching start_urls are kept in memory
+    start_urls_cache_size = 1000
     stop_urls = []
     stop_content = []
     strategy = 'default'
@@ -65,14 +79,49 @@ class ConfigLoader:
     config_original_content = None
 
     driver = None
+    page_ready = None
 
     sitemap_alternate_links = False
     sitemap_urls = []
     sitemap_urls_regexs = []
     force_sitemap_urls_crawling = False
 
+    # 'compat' keeps the objectIDs of previous crawls, 'fast' hashes faster
+    object_id_mode = 'compat'
+
     nb_hits_max = 6000000
 
+    # Number of headless browsers rendering the pages with js_render
+    browser_pool_size = 1
+
+    # Number of processes extracting records, 0 extracts them in the crawler
+    parse_workers = 0
+
+    # Records are sent to Algolia by batches of batch_size records or
+    # batch_max_bytes bytes, at least every batch_flush_interval seconds,
+    # with batch_concurrency batches sent at the same time
+    batch_size = 1000
+    batch_max_bytes = 5000000
+    batch_flush_interval = 5
+    batch_concurrency = 4
+    # Batches are sent gzipped
+    batch_gzip = True
+
+    # Directory where the records are written as JSONL files instead of being
+    # sent to Algolia (or the OUTPUT_PATH env). A new file is started every
+    # output_max_bytes bytes, gzipped with output_gzip
+    output_path = None
+    output_max_bytes = 100000000
+    output_gzip = False
+
+    # Path of the file keeping the digest of the indexed records. With
+    # clear_index false, only the records that changed are sent
+    record_hashes_path = None
+
+    # Path of the file keeping the validators, body and records of every
+    # crawled page, to send conditional requests and reuse unchanged pages
+    http_cache_path = None
+
     def __init__(self, config):
         data = self._load_config(config)
 
@@ -88,6 +137,9 @@ class ConfigLoader:
         # Validate
         ConfigValidator(self).validate()
 
+        self.page_ready = PageReady(self.js_wait_for, self.js_wait_timeout)
+        JsExecutor.page_ready = self.page_ready
+
         # Modify
         self._parse()
 
@@ -127,12 +179,17 @@ class ConfigLoader:
             self.update_nb_hits = bool(strtobool(self.update_nb_hits))
         if self.index_name_tmp is None:
             self.index_name_tmp = os.environ.get('INDEX_NAME_TMP', self.index_name + '_tmp')
+        self.output_path = os.environ.get('OUTPUT_PATH', self.output_path)
 
         # Parse config
         self.selectors = SelectorsParser().parse(self.selectors)
         self.min_indexed_level = SelectorsParser().parse_min_indexed_level(
             self.min_indexed_level)
+        self.selectors_exclude_xpath = SelectorsParser.parse_selectors_exclude(
+            self.selectors_exclude)
         self.start_urls = UrlsParser.parse(self.start_urls)
+        self.start_urls_matcher = StartUrlsMatcher(
+            self.start_urls, cache_size=self.start_urls_cache_size)
 
         # Build default allowed_domains from start_urls and stop_urls
         if self.allowed_domains is None:
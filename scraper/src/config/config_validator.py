@@ -1,3 +1,5 @@
+from ..page_ready import CONDITIONS
+from ..strategies.object_id import MODES as OBJECT_ID_MODES
 
 
 class ConfigValidator:
@@ -33,6 +35,28 @@ class ConfigValidator:
         if self.config.js_wait and not isinstance(self.config.js_wait, int):
             raise Exception('js_wait should be integer')
 
+        if self.config.js_wait_for is not None:
+            if not isinstance(self.config.js_wait_for, dict) or \
+                    len(self.config.js_wait_for) != 1 or \
+                    list(self.config.js_wait_for)[0] not in CONDITIONS:
+                raise Exception(
+                    'js_wait_for should have one key among ' + ', '.join(
+                        CONDITIONS))
+
+            condition, value = list(self.config.js_wait_for.items())[0]
+            if condition == 'network_idle':
+                if isinstance(value, bool) or not isinstance(
+                        value, (int, float)) or value <= 0:
+                    raise Exception(
+                        'js_wait_for network_idle should be a positive number')
+            elif not isinstance(value, str) or len(value) == 0:
+                raise Exception(
+                    'js_wait_for ' + condition + ' should be a non empty string')
+
+        if not isinstance(self.config.js_wait_timeout, (int, float)) or \
+                self.config.js_wait_timeout <= 0:
+            raise Exception('js_wait_timeout should be a positive number')
+
         if self.config.use_anchors and not isinstance(self.config.use_anchors,
                                                       bool):
             raise Exception('use_anchors should be boolean')
@@ -62,3 +86,48 @@ class ConfigValidator:
         if self.config.nb_hits_max and not isinstance(self.config.nb_hits_max,
                                                       int):
             raise Exception('nb_hits_max should be integer')
+
+        if not isinstance(self.config.start_urls_cache_size, int) or \
+                self.config.start_urls_cache_size < 1:
+            raise Exception('start_urls_cache_size should be a positive integer')
+
+        if self.config.object_id_mode not in OBJECT_ID_MODES:
+            raise Exception('object_id_mode should be one of ' + ', '.join(
+                OBJECT_ID_MODES))
+
+        if self.config.selectors_exclude_mode not in ['remove', 'skip']:
+            raise Exception(
+                'selectors_exclude_mode should be "remove" or "skip"')
+
+        if not isinstance(self.config.browser_pool_size, int) or \
+                self.config.browser_pool_size < 1:
+            raise Exception('browser_pool_size should be a positive integer')
+
+        if self.config.parse_workers and not isinstance(
+                self.config.parse_workers, int):
+            raise Exception('parse_workers should be integer')
+
+        for batch_setting in ['batch_size', 'batch_max_bytes',
+                              'batch_concurrency']:
+            value = getattr(self.config, batch_setting)
+            if not isinstance(value, int) or value < 1:
+                raise Exception(batch_setting + ' should be a positive integer')
+
+        # The flusher would wait a negative time between its checks
+        if not isinstance(self.config.batch_flush_interval, (int, float)) or \
+                self.config.batch_flush_interval < 0:
+            raise Exception('batch_flush_interval should be a positive number')
+
+        if not isinstance(self.config.batch_gzip, bool):
+            raise Exception('batch_gzip should be a boolean')
+
+        if self.config.output_path is not None and not isinstance(
+                self.config.output_path, str):
+            raise Exception('output_path should be a string')
+
+        if not isinstance(self.config.output_max_bytes, int) or \
+                self.config.output_max_bytes < 1:
+            raise Exception('output_max_bytes should be a positive integer')
+
+        if not isinstance(self.config.output_gzip, bool):
+            raise Exception('output_gzip should be a boolean')
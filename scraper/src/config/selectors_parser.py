@@ -1,3 +1,5 @@
+from lxml.cssselect import CSSSelector
+
 from ..helpers import css_to_xpath
 
 
@@ -79,3 +81,12 @@ class SelectorsParser:
             }
 
         return min_indexed_level_object
+
+    @staticmethod
+    def parse_selectors_exclude(selectors_exclude):
+        """
+        Return a single XPath matching the elements of every selectors_exclude
+        CSS selector, so they are all found in one pass over the page
+        """
+        return ' | '.join(
+            [CSSSelector(selector).path for selector in selectors_exclude])
@@ -0,0 +1,249 @@
+"""
+StartUrlsMatcher
+Find the start_urls entries matching a page URL without trying the regex of
+every entry
+"""
+
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from ..lru_cache import LruCache
+
+# Character of a literal prefix which can be anything ('.')
+WILDCARD = None
+
+DEFAULT_FLAGS = re.compile('').flags
+
+# Cached results are never None
+MISSING = object()
+
+# Entries only taken into account by some lookups
+SUBSETS = {
+    'extra_attributes': lambda start_url: 'extra_attributes' in start_url,
+    'url_attributes': lambda start_url: any(
+        value is not None for value in start_url['url_attributes'].values()),
+}
+
+
+class _TrieNode:
+    __slots__ = ['children', 'wildcard', 'entries']
+
+    def __init__(self):
+        self.children = {}
+        self.wildcard = None
+        # (position, anchored) of the entries whose prefix ends here
+        self.entries = []
+
+
+class StartUrlsMatcher:
+    """
+    Entries starting with a literal prefix (Ex. https://www.foo.com/docs/) are
+    stored in a trie, only the ones sharing the beginning of the URL are then
+    tried. The other ones are tried at once with a single alternation regex.
+    Like the lookups of UrlsParser, the first entry in start_urls order wins.
+    The results of the cache_size last URLs are kept.
+    """
+
+    def __init__(self, start_urls, positions=None, cache_size=1000):
+        self.start_urls = start_urls
+        self.cache_size = cache_size
+        if positions is None:
+            positions = list(range(len(start_urls)))
+        self.positions = positions
+
+        self.trie = _TrieNode()
+        # Entries without a literal prefix, tried one by one
+        self.unprefixed = []
+        # Entries without a literal prefix, tried with the alternation regex
+        self.combined = []
+
+        for position in positions:
+            compiled_url = start_urls[position]['compiled_url']
+            prefix, anchored = self.get_literal_prefix(compiled_url)
+            if len(prefix) > 0:
+                self._add_to_trie(prefix, position, anchored)
+            elif compiled_url.flags == DEFAULT_FLAGS and \
+                    compiled_url.groups == 0:
+                self.combined.append(position)
+            else:
+                self.unprefixed.append(position)
+
+        self.combined_match = self._compile_alternation(False)
+        self.combined_search = self._compile_alternation(True)
+
+        self.subsets = {}
+        self.cache = LruCache(cache_size)
+
+    @staticmethod
+    def get_literal_prefix(compiled_url):
+        """
+        Return the characters every matching URL starts with, WILDCARD
+        standing for '.', and whether the regex is anchored with ^
+        """
+        prefix = []
+        anchored = False
+        if compiled_url.flags & re.IGNORECASE:
+            return prefix, anchored
+
+        try:
+            parsed = sre_parse.parse(compiled_url.pattern, compiled_url.flags)
+        except re.error:
+            return prefix, anchored
+
+        for op, av in parsed:
+            if op == sre_parse.LITERAL:
+                prefix.append(chr(av))
+            elif op == sre_parse.ANY:
+                prefix.append(WILDCARD)
+            elif op == sre_parse.AT and len(prefix) == 0 and not anchored and \
+                    (av == sre_parse.AT_BEGINNING_STRING or (
+                        av == sre_parse.AT_BEGINNING and not
+                        compiled_url.flags & re.MULTILINE)):
+                anchored = True
+            else:
+                break
+
+        return prefix, anchored
+
+    def _add_to_trie(self, prefix, position, anchored):
+        node = self.trie
+        for char in prefix:
+            if char is WILDCARD:
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                if char not in node.children:
+                    node.children[char] = _TrieNode()
+                node = node.children[char]
+
+        node.entries.append((position, anchored))
+
+    def _compile_alternation(self, anywhere):
+        if len(self.combined) == 0:
+            return None
+
+        # Alternatives are tried in order, each one at every position of the
+        # URL before the next one, so the first entry wins
+        any_prefix = '(?s:.*?)' if anywhere else ''
+        return re.compile('|'.join(
+            [any_prefix + '(?P<_{}>{})'.format(
+                position, self.start_urls[position]['compiled_url'].pattern)
+             for position in self.combined]))
+
+    def _get_trie_candidates(self, url, anywhere):
+        candidates = []
+        for start in range(0, len(url) if anywhere else 1):
+            nodes = [self.trie]
+            for char in url[start:]:
+                next_nodes = []
+                for node in nodes:
+                    child = node.children.get(char)
+                    if child is not None:
+                        next_nodes.append(child)
+                    if node.wildcard is not None:
+                        next_nodes.append(node.wildcard)
+
+                if len(next_nodes) == 0:
+                    break
+
+                for node in next_nodes:
+                    for position, anchored in node.entries:
+                        if start == 0 or not anchored:
+                            candidates.append(position)
+                nodes = next_nodes
+
+        return candidates
+
+    def _matches(self, position, url, anywhere):
+        compiled_url = self.start_urls[position]['compiled_url']
+        if anywhere:
+            return compiled_url.search(url) is not None
+        return compiled_url.match(url) is not None
+
+    def _find(self, url, anywhere, start):
+        candidates = self._get_trie_candidates(url, anywhere) + self.unprefixed
+
+        found = None
+        combined = self.combined_search if anywhere else self.combined_match
+        if combined is not None and start == 0:
+            result = combined.match(url)
+            if result is not None:
+                found = int(result.lastgroup[1:])
+        else:
+            # An entry before start could hide the following ones
+            candidates += self.combined
+
+        for position in sorted(set(candidates)):
+            if position < start:
+                continue
+            if found is not None and position > found:
+                break
+            if self._matches(position, url, anywhere):
+                return position
+
+        return found
+
+    def find(self, url, anywhere=False, start=0):
+        """
+        Return the position of the first entry from start matching the URL,
+        from its beginning (re.match) or anywhere (re.search)
+        """
+        key = (url, anywhere, start)
+        position = self.cache.get(key, MISSING)
+        if position is MISSING:
+            position = self._find(url, anywhere, start)
+            self.cache.set(key, position)
+
+        return position
+
+    def get_subset(self, name):
+        """Matcher of the entries of the SUBSETS name"""
+        if name not in self.subsets:
+            self.subsets[name] = StartUrlsMatcher(self.start_urls, [
+                position for position in self.positions if
+                SUBSETS[name](self.start_urls[position])], self.cache_size)
+
+        return self.subsets[name]
+
+    def match(self, url):
+        position = self.find(url)
+        return self.start_urls[position] if position is not None else None
+
+    def get_tags(self, url):
+        start_url = self.match(url)
+        return start_url['tags'] if start_url is not None else []
+
+    def get_page_rank(self, url):
+        start_url = self.match(url)
+        return int(start_url['page_rank']) if start_url is not None else 0
+
+    def get_extra_attributes(self, url):
+        start_url = self.get_subset('extra_attributes').match(url)
+        return start_url['extra_attributes'] if start_url is not None else {}
+
+    def get_selectors_key(self, url):
+        position = self.find(url, anywhere=True)
+        if position is None:
+            return 'default'
+
+        return self.start_urls[position]['selectors_key']
+
+    def get_url_variables(self, url):
+        """Same as UrlsParser.get_url_variables"""
+        matcher = self.get_subset('url_attributes')
+        position = matcher.find(url, anywhere=True)
+        while position is not None:
+            url_attributes = self.start_urls[position]['url_attributes']
+            for attr in url_attributes:
+                value = url_attributes[attr]
+                if value is not None:
+                    url = url.replace(value, '')
+                    yield attr, value, url
+
+            # Next entries are matched against the URL without the values
+            position = matcher.find(url, anywhere=True, start=position + 1)
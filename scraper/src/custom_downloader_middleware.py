@@ -2,18 +2,21 @@
 CustomDownloaderMiddleware
 """
 
-import time
 import requests
 
 from scrapy.http import HtmlResponse
+from twisted.internet import defer, threads
 from urllib.parse import urlparse, unquote_plus
 
 
 class CustomDownloaderMiddleware:
-    driver = None
+    browser_pool = None
 
     def __init__(self):
-        self.driver = CustomDownloaderMiddleware.driver
+        self.browser_pool = CustomDownloaderMiddleware.browser_pool
+        # Threads only wait for the browsers, never for a free browser
+        self.idle_browsers = defer.DeferredSemaphore(
+            len(self.browser_pool)) if self.browser_pool else None
 
     def process_request(self, request, spider):
         if not spider.js_render:
@@ -23,18 +26,25 @@ class CustomDownloaderMiddleware:
             o = urlparse(request.url)
             url_without_params = o.scheme + "://" + o.netloc + o.path
             request = request.replace(url=url_without_params)
+
+        # Render off the reactor thread, as many pages at a time as browsers
+        return self.idle_browsers.run(threads.deferToThread, self.render,
+                                      request, spider)
+
+    def render(self, request, spider):
         print("Getting " + request.url + " from selenium")
 
-        self.driver.get(unquote_plus(
-            request.url))  # Decode url otherwise firefox is not happy. Ex /#%21/ => /#!/%21
-        time.sleep(spider.js_wait)
-        body = None
-        if request.flags is not None and "sitemap" in request.flags:
-            body = requests.get(request.url).content
-        else:
-            body = self.driver.execute_script("return document.documentElement.getInnerHTML();")
+        with self.browser_pool.browser() as driver:
+            driver.get(unquote_plus(
+                request.url))  # Decode url otherwise firefox is not happy. Ex /#%21/ => /#!/%21
+            spider.page_ready.wait(driver, spider.js_wait)
+            body = None
+            if request.flags is not None and "sitemap" in request.flags:
+                body = requests.get(request.url).content
+            else:
+                body = driver.execute_script("return document.documentElement.getInnerHTML();")
 
-        url = self.driver.current_url
+            url = driver.current_url
 
         return HtmlResponse(
             url=url,
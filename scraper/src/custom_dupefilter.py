@@ -22,10 +22,26 @@ class CustomDupeFilter(RFPDupeFilter):
         encode.('utf-8) & in order to be no scheme compliant
         """
 
+        if include_headers:
+            include_headers = tuple(to_bytes(h.lower())
+                                    for h in sorted(include_headers))
+        cache = _fingerprint_cache.setdefault(request, {})
+
+        if include_headers not in cache or not remove_scheme:
+            # Since it is called from the same function, wee need to ensure
+            # we compute the fingerprint which take into account the scheme.
+            # Avoid caching
+            cache[include_headers] = CustomDupeFilter.compute_fingerprint(
+                request, self.use_anchors, include_headers, remove_scheme)
+        return cache[include_headers]
+
+    @staticmethod
+    def compute_fingerprint(request, use_anchors, include_headers=None,
+                            remove_scheme=None):
         # If use_anchors, anchors in URL matters since each anchor
         # define a different webpage and content (special js_rendering)
         url_for_finger_print = canonicalize_url(
-            request.url) if not self.use_anchors else request.url
+            request.url) if not use_anchors else request.url
         url_for_hash = url_for_finger_print.encode('utf-8')
 
         # scheme agnosticism
@@ -34,27 +50,17 @@ class CustomDupeFilter(RFPDupeFilter):
             url_for_hash = re.sub(match_capture_any_scheme, r"\2",
                                   url_for_finger_print)
 
+        fp = hashlib.sha1()
+        fp.update(to_bytes(request.method.encode('utf-8')))
+        fp.update(to_bytes(url_for_hash))
+        fp.update(request.body or ''.encode('utf-8'))
         if include_headers:
-            include_headers = tuple(to_bytes(h.lower())
-                                    for h in sorted(include_headers))
-        cache = _fingerprint_cache.setdefault(request, {})
-
-        if include_headers not in cache or not remove_scheme:
-            # Since it is called from the same function, wee need to ensure
-            # we compute the fingerprint which take into account the scheme.
-            # Avoid caching
-            fp = hashlib.sha1()
-            fp.update(to_bytes(request.method.encode('utf-8')))
-            fp.update(to_bytes(url_for_hash))
-            fp.update(request.body or ''.encode('utf-8'))
-            if include_headers:
-                for hdr in include_headers:
-                    if hdr in request.headers:
-                        fp.update(hdr)
-                        for v in request.headers.getlist(hdr):
-                            fp.update(v)
-            cache[include_headers] = fp.hexdigest()
-        return cache[include_headers]
+            for hdr in include_headers:
+                if hdr in request.headers:
+                    fp.update(hdr)
+                    for v in request.headers.getlist(hdr):
+                        fp.update(v)
+        return fp.hexdigest()
 
     def __init__(self, path=None, debug=False, use_anchors=False):
         super(CustomDupeFilter, self).__init__(path=path, debug=debug)
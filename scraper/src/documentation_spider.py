@@ -15,7 +15,7 @@ import os
 
 from scrapy.spidermiddlewares.httperror import HttpError
 
-from scrapy.exceptions import CloseSpider
+from scrapy.exceptions import CloseSpider, DontCloseSpider
 
 from algoliasearch.search_client import SearchClient
 
@@ -55,8 +55,11 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
     NB_INDEXED = 0  # Add this line
     algolia_helper = None
     strategy = None
+    parse_pool = None
+    validator_cache = None
     js_render = False
     js_wait = 0
+    page_ready = None
     match_capture_any_scheme = re.compile(r"^(https?)(.*)")
     backreference_any_scheme = r"^https?\2(.*)$"
     # Could be any url prefix such as http://www or http://
@@ -93,9 +96,11 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
     def from_crawler(cls, crawler, *args, **kwargs):
         spider = super(DocumentationSpider, cls).from_crawler(crawler, *args, **kwargs)
         crawler.signals.connect(spider.engine_stopped, signal=signals.engine_stopped)
+        crawler.signals.connect(spider.spider_idle, signal=signals.spider_idle)
         return spider
 
-    def __init__(self, config, algolia_helper, strategy, *args, **kwargs):
+    def __init__(self, config, algolia_helper, strategy, parse_pool=None,
+                 validator_cache=None, *args, **kwargs):
         # Scrapy config
         self.name = config.index_name
         self.allowed_domains = config.allowed_domains
@@ -105,8 +110,12 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
                           stop_url in config.stop_urls]
         self.algolia_helper = algolia_helper
         self.strategy = strategy
+        self.parse_pool = parse_pool
+        self.validator_cache = validator_cache
+        self.start_urls_cache = config.start_urls_matcher.cache
         self.js_render = config.js_render
         self.js_wait = config.js_wait
+        self.page_ready = config.page_ready
         self.scrape_start_urls = config.scrape_start_urls
         self.remove_get_params = config.remove_get_params
         self.strict_redirect = config.strict_redirect
@@ -268,11 +277,47 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
 
         if 200 <= status < 300:
             self.successfully_indexed += 1
+            validator_cache = self.get_validator_cache()
+
+            if validator_cache is not None:
+                records = validator_cache.get_records(response)
+                if records is not None:
+                    # The page didn't change since the previous crawl
+                    self.index_records(records, original_url, from_sitemap)
+                    return
+
+            if self.parse_pool is not None:
+                # Records are indexed once a worker has extracted them
+                self.parse_pool.submit(
+                    response,
+                    lambda records: self.index_extracted_records(
+                        response, records, from_sitemap))
+                return
+
+            if validator_cache is None:
+                # Records are sent to the index as they are extracted
+                self.index_records(
+                    self.strategy.iter_records_from_response(response),
+                    original_url, from_sitemap)
+                return
+
             records = self.strategy.get_records_from_response(response)
-            self.algolia_helper.add_records(records, response.url, from_sitemap)
-            DocumentationSpider.NB_INDEXED += len(records)
-        else:
-            return
+            self.index_extracted_records(response, records, from_sitemap)
+
+    def get_validator_cache(self):
+        # The body of a rendered page isn't the one the validators describe
+        return None if self.js_render else self.validator_cache
+
+    def index_extracted_records(self, response, records, from_sitemap):
+        validator_cache = self.get_validator_cache()
+        if validator_cache is not None:
+            validator_cache.store(response, records)
+
+        self.index_records(records, response.url, from_sitemap)
+
+    def index_records(self, records, url, from_sitemap):
+        DocumentationSpider.NB_INDEXED += self.algolia_helper.add_records(
+            records, url, from_sitemap)
 
         # Arbitrary limit check moved after successful processing
         if self.nb_hits_max > 0 and DocumentationSpider.NB_INDEXED > self.nb_hits_max:
@@ -285,6 +330,11 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
     def remove_records(self):
         if len(self.docs_to_remove) == 0:
             return
+        if not self.algolia_helper.uses_algolia():
+            # No index is changed when the records are written to files
+            print('\033[93m> DocSearch: \033[0m{} removed files are not '
+                  'deleted from the index'.format(len(self.docs_to_remove)))
+            return
         try:
             algolia_client = SearchClient.create(self.app_id, self.api_key)
             algolia_index = algolia_client.init_index(self.index_name)
@@ -415,6 +465,11 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
             self._cbs.append((regex(r), c))
         self._follow = [regex(x) for x in self.sitemap_follow]
 
+    def spider_idle(self):
+        """Keep the spider open until every page sent to the parse pool is indexed"""
+        if self.parse_pool is not None and self.parse_pool.has_pending():
+            raise DontCloseSpider
+
     def engine_stopped(self):
         """Print statistics after the spider finishes."""
         print("\n=== Crawling Statistics ===")
@@ -423,6 +478,7 @@ class DocumentationSpider(CrawlSpider, SitemapSpider):
         print(f"  Total failed:          {self.failed_indexing}")
         print(f"  404 errors:            {self.failed_indexing_404}")
         print(f"  500 errors:            {self.failed_indexing_500}")
+        print(f"Start URLs cache:         {self.start_urls_cache.get_report()}")
         
         if self.failed_500_urls:
             print("\nFiles failed with 500 error:")
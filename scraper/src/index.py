@@ -12,9 +12,15 @@ from .algolia_helper import AlgoliaHelper
 from .config.config_loader import ConfigLoader
 from .documentation_spider import DocumentationSpider
 from .strategies.default_strategy import DefaultStrategy
+from .strategies.single_pass_strategy import SinglePassStrategy
 from .custom_downloader_middleware import CustomDownloaderMiddleware
 from .custom_dupefilter import CustomDupeFilter
+from .conditional_request_middleware import ConditionalRequestMiddleware
 from .config.browser_handler import BrowserHandler
+from .parse_pool import ParsePool
+from .record_hash_store import RecordHashStore
+from .output_sink import JsonlSink
+from .validator_cache import ValidatorCache
 from .strategies.algolia_settings import AlgoliaSettings
 
 try:
@@ -28,13 +34,26 @@ except ImportError:
 
 EXIT_CODE_NO_RECORD = 3
 
+STRATEGIES = {
+    'default': DefaultStrategy,
+    'single_pass': SinglePassStrategy,
+}
+
 
 def run_config(config):
     config = ConfigLoader(config)
-    CustomDownloaderMiddleware.driver = config.driver
-    DocumentationSpider.NB_INDEXED = 0
+    strategy = STRATEGIES.get(config.strategy, DefaultStrategy)(config)
 
-    strategy = DefaultStrategy(config)
+    # Workers are forked first: no thread, browser or SQLite connection
+    # (batch writer, hash store, validator cache) is copied in them
+    parse_pool = ParsePool(strategy, config.parse_workers) \
+        if config.parse_workers > 0 else None
+
+    browser_pool = BrowserHandler.init_pool(config.driver,
+                                            config.browser_pool_size,
+                                            config.user_agent) \
+        if config.js_render else None
+    DocumentationSpider.NB_INDEXED = 0
 
     algolia_helper = AlgoliaHelper(
         config.app_id,
@@ -44,10 +63,28 @@ def run_config(config):
         AlgoliaSettings.get(config, strategy.levels),
         config.query_rules,
         config.clear_index,
+        config.batch_size,
+        config.batch_max_bytes,
+        config.batch_flush_interval,
+        config.batch_concurrency,
+        RecordHashStore(config.record_hashes_path) if config.record_hashes_path else None,
+        # Only a full crawl tells which records vanished
+        not config.is_file_update,
+        config.batch_gzip,
+        JsonlSink(config.output_path, config.output_max_bytes, config.output_gzip)
+        if config.output_path else None,
     )
 
+    validator_cache = ValidatorCache(
+        config.http_cache_path, config.use_anchors,
+        ValidatorCache.get_config_digest(config.config_content)) \
+        if config.http_cache_path else None
+    ConditionalRequestMiddleware.validator_cache = validator_cache
+
     root_module = 'src.' if __name__ == '__main__' else 'scraper.src.'
     DOWNLOADER_MIDDLEWARES_PATH = root_module + 'custom_downloader_middleware.' + CustomDownloaderMiddleware.__name__
+    CONDITIONAL_REQUEST_MIDDLEWARE_PATH = root_module + 'conditional_request_middleware.' + \
+        ConditionalRequestMiddleware.__name__
     DUPEFILTER_CLASS_PATH = root_module + 'custom_dupefilter.' + CustomDupeFilter.__name__
 
     headers = {
@@ -77,27 +114,41 @@ def run_config(config):
         'LOG_ENABLED': '1',
         'LOG_LEVEL': 'ERROR',
         'USER_AGENT': config.user_agent,
-        'DOWNLOADER_MIDDLEWARES': {DOWNLOADER_MIDDLEWARES_PATH: 900},
+        'DOWNLOADER_MIDDLEWARES': {DOWNLOADER_MIDDLEWARES_PATH: 900,
+                                   CONDITIONAL_REQUEST_MIDDLEWARE_PATH: 950},
         # Need to be > 600 to be after the redirectMiddleware
         'DUPEFILTER_USE_ANCHORS': config.use_anchors,
         # Use our custom dupefilter in order to be scheme agnostic regarding link provided
         'DUPEFILTER_CLASS': DUPEFILTER_CLASS_PATH,
         'DEFAULT_REQUEST_HEADERS': DEFAULT_REQUEST_HEADERS,
-        'TELNETCONSOLE_ENABLED': False
+        'TELNETCONSOLE_ENABLED': False,
+        # Rendering threads come on top of the ones resolving DNS
+        'REACTOR_THREADPOOL_MAXSIZE': 10 + config.browser_pool_size
     })
 
     process.crawl(
         DocumentationSpider,
         config=config,
         algolia_helper=algolia_helper,
-        strategy=strategy
+        strategy=strategy,
+        parse_pool=parse_pool,
+        validator_cache=validator_cache
     )
 
     process.start()
     process.stop()
 
-    # Kill browser if needed
-    BrowserHandler.destroy(config.driver)
+    if parse_pool is not None:
+        parse_pool.close()
+
+    if validator_cache is not None:
+        validator_cache.close()
+
+    # Kill browsers if needed
+    if browser_pool is not None:
+        browser_pool.close()
+    else:
+        BrowserHandler.destroy(config.driver)
 
     if len(config.extra_records) > 0:
         algolia_helper.add_records(config.extra_records, "Extra records", False)
@@ -114,6 +165,48 @@ def run_config(config):
     print("")
 
 
+def replay_records(config, path):
+    """Send the records written to path by a run with output_path to the
+    index, through a temporary index set up as by a run with clear_index"""
+    config = ConfigLoader(config)
+    # Only needed to read the start_urls variables of the config
+    BrowserHandler.destroy(config.driver)
+    paths = JsonlSink.get_paths(path)
+
+    algolia_helper = AlgoliaHelper(
+        config.app_id,
+        config.api_key,
+        config.index_name,
+        config.index_name_tmp,
+        AlgoliaSettings.get(
+            config, STRATEGIES.get(config.strategy, DefaultStrategy).levels),
+        config.query_rules,
+        True,
+        config.batch_size,
+        config.batch_max_bytes,
+        config.batch_flush_interval,
+        config.batch_concurrency,
+        None,
+        False,
+        config.batch_gzip,
+    )
+
+    nb_records = 0
+    for file_path in paths:
+        nb_records += algolia_helper.add_records(JsonlSink.read(file_path),
+                                                 file_path, False)
+
+    print("")
+
+    if nb_records > 0:
+        algolia_helper.commit_tmp_index()
+        print('Nb hits: {}'.format(nb_records))
+    else:
+        print('Replay issue: no records in ' + path)
+        exit(EXIT_CODE_NO_RECORD)
+    print("")
+
+
 if __name__ == '__main__':
     from os import environ
 
@@ -1,17 +1,20 @@
-import time
 import json
 
+from .page_ready import PageReady
+
 
 class JsExecutor:
     driver = None
+    page_ready = PageReady()
 
     def __init__(self):
         self.driver = JsExecutor.driver
+        self.page_ready = JsExecutor.page_ready
 
     # TODO: find out why JsExecutor.driver couldn't be used
     def execute(self, url, js):
         self.driver.get(url)
-        time.sleep(5)
+        self.page_ready.wait(self.driver, 5)
 
         result = self.driver.execute_script(js)
 
@@ -0,0 +1,52 @@
+"""
+LruCache
+Dict keeping the max_size most recently used values, safe to use from
+several threads
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LruCache:
+    """LruCache"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Sent to the parse workers with the config, a lock can't be pickled
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.values:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self.values.move_to_end(key)
+            return self.values[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.values[key] = value
+            self.values.move_to_end(key)
+            if len(self.values) > self.max_size:
+                self.values.popitem(last=False)
+
+    def get_report(self):
+        return '{} hits, {} misses'.format(self.hits, self.misses)
@@ -0,0 +1,152 @@
+"""OutputSink
+Where the records end up: the temporary Algolia index, or local JSONL files
+when crawling without Algolia"""
+
+import gzip
+import json
+import os
+import re
+
+from .batch_serializer import BatchSerializer, GZIP_LEVEL
+from .batch_writer import BatchWriter
+
+# Lists the files written by the run, the only ones readers should use
+MANIFEST = 'manifest.json'
+RECORDS_FILE = re.compile(r'^records-\d{5}\.jsonl(\.gz)?$')
+
+
+class AlgoliaSink:
+    """Send the records to the index by batches, in the background"""
+
+    def __init__(self, algolia_index, batch_size=1000,
+                 batch_max_bytes=5000000, batch_flush_interval=5,
+                 batch_concurrency=4, batch_gzip=True):
+        self.algolia_index = algolia_index
+        # Each record is serialized once
+        self.batch_serializer = BatchSerializer(compress=batch_gzip)
+        self.batch_writer = BatchWriter(self.send_batch, batch_size,
+                                        batch_max_bytes, batch_flush_interval,
+                                        batch_concurrency,
+                                        self.batch_serializer.serialize_record)
+
+    def send_batch(self, serialized_records):
+        self.batch_serializer.send_batch(self.algolia_index,
+                                         serialized_records)
+
+    def add(self, record):
+        self.batch_writer.add(record)
+
+    def close(self):
+        """Wait for every record to be in the index"""
+        self.batch_writer.close()
+
+    def get_report(self):
+        return 'index ' + self.algolia_index.name
+
+
+class JsonlSink:
+    """
+    Write the records to the records-00000.jsonl files of a directory, one
+    JSON record per line, in the order they are added. A new file is started
+    once the current one holds max_bytes bytes of records. With compress,
+    files are gzipped (.jsonl.gz).
+    The records files of a previous run are removed when the sink is created,
+    and manifest.json lists the files of the run once it is closed.
+    """
+
+    def __init__(self, path, max_bytes=100000000, compress=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.serializer = BatchSerializer(compress=False)
+
+        self.paths = []
+        self.file = None
+        self.file_bytes = 0
+
+        self.nb_records = 0
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self._remove_previous_run()
+
+    def _remove_previous_run(self):
+        # The manifest first: an interrupted run leaves no valid output
+        for name in [MANIFEST] + sorted(os.listdir(self.path)):
+            if name == MANIFEST or RECORDS_FILE.match(name):
+                file_path = os.path.join(self.path, name)
+                if os.path.isfile(file_path):
+                    os.remove(file_path)
+
+    def _open_next_file(self):
+        self._close_file()
+
+        extension = '.jsonl.gz' if self.compress else '.jsonl'
+        path = os.path.join(self.path, 'records-{:05d}{}'.format(
+            len(self.paths), extension))
+        self.paths.append(path)
+
+        if self.compress:
+            self.file = gzip.open(path, 'wb', GZIP_LEVEL)
+        else:
+            self.file = open(path, 'wb')
+        self.file_bytes = 0
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def add(self, record):
+        line = self.serializer.serialize(record) + b'\n'
+        if self.file is None or self.file_bytes >= self.max_bytes:
+            self._open_next_file()
+
+        self.file.write(line)
+        self.file_bytes += len(line)
+        self.nb_records += 1
+
+    def close(self):
+        self._close_file()
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {
+            'files': [os.path.basename(path) for path in self.paths],
+            'nb_records': self.nb_records
+        }
+        manifest_path = os.path.join(self.path, MANIFEST)
+        with open(manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + '.tmp', manifest_path)
+
+    def get_report(self):
+        return '{} files in {}'.format(len(self.paths), self.path)
+
+    @staticmethod
+    def get_paths(path):
+        """
+        The files written to the path directory by its last run, in order, or
+        path itself when it is a file
+        """
+        if not os.path.isdir(path):
+            return [path]
+
+        manifest_path = os.path.join(path, MANIFEST)
+        if not os.path.isfile(manifest_path):
+            raise Exception(path + ' has no ' + MANIFEST + ', the run writing '
+                            'it was interrupted or is not done')
+
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+        return [os.path.join(path, name) for name in manifest['files']]
+
+    @staticmethod
+    def read(path):
+        """Yield the records of a file, gzipped or not"""
+        open_file = gzip.open if path.endswith('.gz') else open
+        with open_file(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line.decode('utf-8'))
@@ -0,0 +1,63 @@
+"""
+PageReady
+Wait until a page rendered by the browser is ready to be read, instead of
+sleeping a fixed time
+"""
+
+import time
+
+from selenium.common.exceptions import JavascriptException, \
+    TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# A page is idle once no resource finished loading for `network_idle` ms.
+# Pending requests only show up once they are done, the quiet period covers
+# the ones started right before.
+NETWORK_IDLE_SCRIPT = """
+if (document.readyState !== 'complete') {
+    return false;
+}
+var last_response = performance.getEntriesByType('resource').reduce(
+    function (last, entry) { return Math.max(last, entry.responseEnd); }, 0);
+return performance.now() - last_response >= arguments[0];
+"""
+
+SELECTOR_SCRIPT = "return document.querySelector(arguments[0]) !== null;"
+
+CONDITIONS = ['selector', 'network_idle', 'script']
+
+
+class PageReady:
+    """PageReady"""
+
+    def __init__(self, condition=None, timeout=10, poll_frequency=0.05):
+        self.condition = condition
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+
+    def wait(self, driver, fallback_wait):
+        """Wait for the condition, or sleep fallback_wait seconds without one"""
+        if self.condition is None:
+            time.sleep(fallback_wait)
+            return
+
+        try:
+            # A script can throw until the app defining what it reads is loaded
+            WebDriverWait(driver, self.timeout,
+                          poll_frequency=self.poll_frequency,
+                          ignored_exceptions=(JavascriptException,)).until(
+                self.is_ready)
+        except TimeoutException:
+            print('\033[93m> DocSearch: \033[0m{} not ready after {}s, '
+                  'reading it anyway'.format(driver.current_url,
+                                             self.timeout))
+
+    def is_ready(self, driver):
+        if 'selector' in self.condition:
+            return driver.execute_script(SELECTOR_SCRIPT,
+                                         self.condition['selector'])
+        if 'network_idle' in self.condition:
+            return driver.execute_script(NETWORK_IDLE_SCRIPT,
+                                         self.condition['network_idle'])
+
+        return driver.execute_script(self.condition['script'])
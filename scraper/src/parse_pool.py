@@ -0,0 +1,79 @@
+"""
+ParsePool
+Extract the records of the crawled pages in worker processes, so parsing
+doesn't block the downloads happening in the reactor thread
+"""
+
+import copy
+from multiprocessing import Pool
+
+from scrapy.http import HtmlResponse
+
+# Strategy of the current worker process, built once by _init_worker
+_worker_strategy = None
+
+
+def _init_worker(strategy_class, config):
+    global _worker_strategy
+    _worker_strategy = strategy_class(config)
+
+
+def _get_records(url, body, encoding):
+    response = HtmlResponse(url=url, body=body, encoding=encoding)
+    return _worker_strategy.get_records_from_response(response)
+
+
+class ParsePool:
+    """ParsePool"""
+
+    def __init__(self, strategy, nb_workers):
+        self.nb_pending = 0
+        self.pool = Pool(nb_workers, initializer=_init_worker,
+                         initargs=(strategy.__class__,
+                                   self.get_worker_config(strategy)))
+
+    @staticmethod
+    def get_worker_config(strategy):
+        """
+        Config sent to the workers, pickled unless they are forked (Ex.
+        spawn on macOS and Windows)
+        """
+        # A browser can't be shared with other processes, workers only parse
+        config = copy.copy(strategy.config)
+        config.driver = None
+        return config
+
+    def submit(self, response, callback):
+        """
+        Extract the records of the response in a worker process, callback is
+        then called with them from the reactor thread
+        """
+        self.nb_pending += 1
+        self.pool.apply_async(
+            _get_records,
+            (response.url, response.body, response.encoding),
+            callback=lambda records: self._call_from_reactor(
+                self._on_records, callback, records),
+            error_callback=lambda error: self._call_from_reactor(
+                self._on_error, response.url, error))
+
+    def has_pending(self):
+        return self.nb_pending > 0
+
+    @staticmethod
+    def _call_from_reactor(function, *args):
+        # Pool callbacks are run by a thread of the pool
+        from twisted.internet import reactor
+        reactor.callFromThread(function, *args)
+
+    def _on_records(self, callback, records):
+        self.nb_pending -= 1
+        callback(records)
+
+    def _on_error(self, url, error):
+        self.nb_pending -= 1
+        print('\033[91m> Parsing error: \033[0m{} ({})'.format(url, error))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,82 @@
+"""RecordHashStore
+Remember a digest of every record sent to the index, keyed by objectID, to
+only send the records which changed since the previous crawl"""
+
+import hashlib
+import json
+import sqlite3
+
+from .strategies.record import Record
+
+
+class RecordHashStore:
+    """RecordHashStore"""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS records ('
+            'object_id TEXT PRIMARY KEY, '
+            'digest TEXT NOT NULL, '
+            'seen INTEGER NOT NULL DEFAULT 0)')
+        self.connection.commit()
+
+        # Nothing is saved until the crawl is committed
+        self.connection.execute('UPDATE records SET seen = 0')
+
+        self.nb_added = 0
+        self.nb_changed = 0
+        self.nb_unchanged = 0
+        self.nb_deleted = 0
+
+    @staticmethod
+    def get_digest(record):
+        return hashlib.sha1(
+            json.dumps(Record.as_dict(record), sort_keys=True).encode(
+                'utf-8')).hexdigest()
+
+    def has_changed(self, record):
+        """Remember the record, return False if it is already in the index"""
+        object_id = record.get('objectID')
+        if object_id is None:
+            return True
+
+        digest = self.get_digest(record)
+        row = self.connection.execute(
+            'SELECT digest FROM records WHERE object_id = ?',
+            (object_id,)).fetchone()
+
+        if row is None:
+            self.connection.execute(
+                'INSERT INTO records (object_id, digest, seen) VALUES (?, ?, 1)',
+                (object_id, digest))
+            self.nb_added += 1
+            return True
+
+        self.connection.execute(
+            'UPDATE records SET digest = ?, seen = 1 WHERE object_id = ?',
+            (digest, object_id))
+
+        if row[0] == digest:
+            self.nb_unchanged += 1
+            return False
+
+        self.nb_changed += 1
+        return True
+
+    def get_vanished_object_ids(self):
+        """objectIDs of the records that were not crawled this time"""
+        return [row[0] for row in self.connection.execute(
+            'SELECT object_id FROM records WHERE seen = 0')]
+
+    def forget_vanished(self):
+        self.nb_deleted = self.connection.execute(
+            'DELETE FROM records WHERE seen = 0').rowcount
+
+    def save(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def get_report(self):
+        return '{} added, {} changed, {} unchanged, {} deleted'.format(
+            self.nb_added, self.nb_changed, self.nb_unchanged, self.nb_deleted)
@@ -1,23 +1,36 @@
-from lxml.cssselect import CSSSelector
+from lxml.etree import XPath
 import lxml
 import re
 import json
-import html
+
+from ..config.selectors_parser import SelectorsParser
 
 """
 Abstract Strategy
 """
 
+# Characters escaped in the records, "&" is left as is
+ESCAPED_CHARS = {
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+}
+
 
 class AbstractStrategy:
     """
     Abstract Strategy
     """
     config = None
+    keep_tags = []
+    escape_pattern = re.compile('[<>"\']')
 
     def __init__(self, config):
         self.config = config
         AbstractStrategy.keep_tags = config.keep_tags
+        AbstractStrategy.escape_pattern = AbstractStrategy.compile_escape_pattern(
+            config.keep_tags)
 
     @staticmethod
     def pprint(data):
@@ -34,10 +47,14 @@ class AbstractStrategy:
             return response.body
 
     @staticmethod
-    def get_dom(response):
-        """Get the DOM representation of the webpage"""
+    def get_dom(response, body=None):
+        """
+        Get the DOM representation of the webpage, body is the response body
+        if it was already decoded
+        """
         try:
-            body = response.body.decode(response.encoding)
+            if body is None:
+                body = response.body.decode(response.encoding)
             result = lxml.html.fromstring(body)
         except (UnicodeError, ValueError):
             result = lxml.html.fromstring(response.body)
@@ -53,10 +70,8 @@ class AbstractStrategy:
         selectors_key = 'default'
 
         if url is not None:
-            for start_url in self.config.start_urls:
-                if re.search(start_url['compiled_url'], url) is not None:
-                    selectors_key = start_url['selectors_key']
-                    break
+            selectors_key = self.config.start_urls_matcher.get_selectors_key(
+                url)
 
         return selectors_key
 
@@ -76,47 +91,154 @@ class AbstractStrategy:
 
         return self.config.min_indexed_level[selectors_key]
 
+    @staticmethod
+    def get_node_text(node):
+        if node.tag not in AbstractStrategy.keep_tags:
+            return node.text
+        return '<' + node.tag + '>' + node.text + '</' + node.tag + '>'
+
     @staticmethod
     def itertext(node):
+        """
+        Yield the text and the tails of the node and its descendants, in
+        document order. Comments and processing instructions only give
+        their tail.
+        """
         tag = node.tag
         if not isinstance(tag, str) and tag is not None:
             return
 
         if node.text:
-            if node.tag not in AbstractStrategy.keep_tags:
-                yield node.text
+            yield AbstractStrategy.get_node_text(node)
+
+        # Walk the tree with a stack of (children left, parent) instead of
+        # nested generators, every fragment would go through all of them
+        stack = [(iter(node), None)]
+        while stack:
+            children, parent = stack[-1]
+            for e in children:
+                tag = e.tag
+                if isinstance(tag, str) or tag is None:
+                    if e.text:
+                        yield AbstractStrategy.get_node_text(e)
+                    stack.append((iter(e), e))
+                    break
+                if e.tail:
+                    yield e.tail
             else:
-                yield '<' + node.tag + '>' + node.text + '</' + node.tag + '>'
-        for e in node:
-            for s in AbstractStrategy.itertext(e):
-                yield s
-            if e.tail:
-                yield e.tail
+                stack.pop()
+                if parent is not None and parent.tail:
+                    yield parent.tail
+
+    @staticmethod
+    def get_kept_node_text(node, text):
+        if node.tag not in AbstractStrategy.keep_tags:
+            return text
+        return '<' + node.tag + '>' + text + '</' + node.tag + '>'
+
+    @staticmethod
+    def get_kept_children(node, excluded):
+        """
+        Return the text of the node and its children with their tail, as they
+        would be once the excluded children are removed with drop_tree: the
+        tail of a removed child is appended to the previous sibling tail or to
+        the node text
+        """
+        text = node.text
+        children = []
+        for child in node:
+            if child not in excluded:
+                children.append((child, child.tail))
+            elif child.tail:
+                if len(children) > 0:
+                    previous, tail = children[-1]
+                    children[-1] = (previous, (tail or '') + child.tail)
+                else:
+                    text = (text or '') + child.tail
+
+        return text, children
+
+    @staticmethod
+    def itertext_skipping(node, excluded):
+        """
+        Same fragments as itertext once the excluded elements are removed from
+        the DOM, without removing them
+        """
+        tag = node.tag
+        if not isinstance(tag, str) and tag is not None:
+            return
+
+        text, children = AbstractStrategy.get_kept_children(node, excluded)
+        if text:
+            yield AbstractStrategy.get_kept_node_text(node, text)
+
+        stack = [(iter(children), None)]
+        while stack:
+            children, parent_tail = stack[-1]
+            for e, tail in children:
+                tag = e.tag
+                if isinstance(tag, str) or tag is None:
+                    text, grandchildren = AbstractStrategy.get_kept_children(
+                        e, excluded)
+                    if text:
+                        yield AbstractStrategy.get_kept_node_text(e, text)
+                    stack.append((iter(grandchildren), tail))
+                    break
+                if tail:
+                    yield tail
+            else:
+                stack.pop()
+                if parent_tail:
+                    yield parent_tail
+
+    @staticmethod
+    def compile_escape_pattern(keep_tags):
+        """Match the opening and closing keep_tags first, they are left as is"""
+        kept = []
+        for tag in keep_tags:
+            kept.append(re.escape("<" + tag + ">"))
+            kept.append(re.escape("</" + tag + ">"))
+
+        return re.compile('|'.join(kept + ['[<>"\']']))
+
+    @staticmethod
+    def escape_match(match):
+        char = match.group(0)
+        return ESCAPED_CHARS.get(char, char)
 
     @staticmethod
     def escape(text):
-        text = html.escape(text)
+        return AbstractStrategy.escape_pattern.sub(
+            AbstractStrategy.escape_match, text)
 
-        for tag in AbstractStrategy.keep_tags:
-            opening_tag = "<" + tag + ">"
-            closing_tag = "</" + tag + ">"
-            text = text.replace(html.escape(opening_tag), opening_tag)
-            text = text.replace(html.escape(closing_tag), closing_tag)
+    @staticmethod
+    def get_text(element, strip_chars=None, text_cache=None, excluded=None):
+        """
+        Return the text content of a DOM node. With a text_cache dict, the
+        text of a node is only computed once for each strip_chars. The text of
+        the excluded elements is left out.
+        """
+        if text_cache is None or isinstance(element, str):
+            return AbstractStrategy._get_text(element, strip_chars, excluded)
 
-        text = text.replace('&amp;', '&')
+        key = (element, strip_chars)
+        if key not in text_cache:
+            text_cache[key] = AbstractStrategy._get_text(element, strip_chars,
+                                                         excluded)
 
-        return text
+        return text_cache[key]
 
     @staticmethod
-    def get_text(element, strip_chars=None):
-        """Return the text content of a DOM node"""
+    def _get_text(element, strip_chars, excluded=None):
         text = element
 
         # Do not call text_content if not needed (Ex. xpath selector with text() doesn't return a node but a string)
         if not isinstance(text, str):
-            text = ""
-            for s in AbstractStrategy.itertext(element):
-                text = text + " " + s
+            if excluded:
+                text = " ".join(
+                    AbstractStrategy.itertext_skipping(element, excluded))
+            else:
+                text = " ".join(AbstractStrategy.itertext(element))
 
         # We call strip a first time for space, tab, newline, return and formfeed
         text = text.strip()
@@ -130,7 +252,8 @@ class AbstractStrategy:
         return AbstractStrategy.escape(text)
 
     @staticmethod
-    def get_text_from_nodes(elements, strip_chars=None):
+    def get_text_from_nodes(elements, strip_chars=None, text_cache=None,
+                            excluded=None):
         """
         Return the text content of a set of DOM nodes.
         elements can contain either an array of nodes or a custom data return from xpath
@@ -143,29 +266,48 @@ class AbstractStrategy:
         if len(elements) == 0:
             return None
 
-        text = ' '.join(
-            [AbstractStrategy.get_text(element, strip_chars) for element in
-             elements
-             if AbstractStrategy.get_text(element, strip_chars) is not None])
+        texts = [AbstractStrategy.get_text(element, strip_chars, text_cache,
+                                           excluded)
+                 for element in elements]
+        text = ' '.join([text for text in texts if text is not None])
 
         if len(text) == 0:
             return None
 
-        return AbstractStrategy.escape(text)
+        # The text of every element is already escaped
+        return text
 
     @staticmethod
     def remove_from_dom(dom, exclude_selectors):
         """Remove any elements matching the selector from the DOM"""
-        for selector in exclude_selectors:
-            matches = CSSSelector(selector)(dom)
-            if len(matches) == 0:
-                continue
+        if len(exclude_selectors) == 0:
+            return dom
 
-            for match in matches:
-                match.drop_tree()
+        exclude_xpath = SelectorsParser.parse_selectors_exclude(
+            exclude_selectors)
+        AbstractStrategy.drop_elements(XPath(exclude_xpath)(dom))
 
         return dom
 
+    @staticmethod
+    def drop_elements(elements):
+        """
+        Remove the elements and their subtree from the DOM, their tail is kept.
+        Elements inside an already removed subtree only change that subtree.
+        """
+        for element in elements:
+            element.drop_tree()
+
+    @staticmethod
+    def get_excluded_elements(elements):
+        """Return every element of the subtree of the elements"""
+        excluded = set()
+        for element in elements:
+            if element not in excluded:
+                excluded.update(element.iter())
+
+        return excluded
+
     @staticmethod
     def elements_are_equals(el1, el2):
         """Checks if two elements are actually the same"""
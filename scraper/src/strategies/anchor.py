@@ -1,3 +1,8 @@
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+# Same selector as element.cssselect('[name],[id]'), compiled once
+NAMED_ELEMENTS = CSSSelector('[name],[id]', translator='html')
 
 
 class Anchor:
@@ -13,7 +18,71 @@ class Anchor:
         return anchor is not None and not anchor.startswith('__') and anchor != ''
 
     @staticmethod
-    def get_anchor(element):
+    def _get_valid_anchor(element):
+        anchor = Anchor._get_anchor_string_from_element(element)
+        return anchor if Anchor._is_valid_anchor(anchor) else None
+
+    @staticmethod
+    def get_anchor_index(dom, excluded=None):
+        """
+        Map every element of the document to its anchor, computed in a single
+        document order pass. Same result as get_anchor without an index, on
+        the document without the excluded elements.
+        """
+        index = {}
+        # Anchor found going back through the previous siblings and parents,
+        # by element
+        preceding = {}
+        # Per open element: its position and its last child seen so far
+        positions = []
+        last_children = [None]
+        last_named = None
+        last_named_position = -1
+        position = 0
+
+        root = dom.getroottree().getroot()
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            # Excluded subtrees are excluded as a whole
+            if excluded and element in excluded:
+                continue
+
+            if event == 'start':
+                previous = last_children[-1]
+                if previous is not None:
+                    preceding[element] = Anchor._get_valid_anchor(
+                        previous) or preceding[previous]
+                elif len(positions) > 0:
+                    parent = element.getparent()
+                    preceding[element] = Anchor._get_valid_anchor(
+                        parent) or preceding[parent]
+                else:
+                    preceding[element] = None
+
+                if element.get('name') is not None or \
+                        element.get('id') is not None:
+                    last_named = element
+                    last_named_position = position
+
+                positions.append(position)
+                last_children[-1] = element
+                last_children.append(None)
+                position += 1
+                continue
+
+            # The last named element of the document is in this subtree if
+            # it came after its start
+            start_position = positions.pop()
+            last_children.pop()
+            anchor = Anchor._get_valid_anchor(element)
+            if anchor is None and last_named_position >= start_position:
+                anchor = Anchor._get_valid_anchor(last_named)
+
+            index[element] = anchor or preceding[element]
+
+        return index
+
+    @staticmethod
+    def get_anchor(element, index=None):
         """
         Return a possible anchor for that element.
         Looks for name and id, and if not found will look in children
@@ -21,13 +90,16 @@ class Anchor:
         if isinstance(element, str):
             return None
 
+        if index is not None and element in index:
+            return index[element]
+
         # Check the name or id on the element
         anchor = Anchor._get_anchor_string_from_element(element)
         if Anchor._is_valid_anchor(anchor):
             return anchor
 
         # Check on child
-        children = element.cssselect('[name],[id]')
+        children = NAMED_ELEMENTS(element)
         if len(children) > 0:
             anchor = Anchor._get_anchor_string_from_element(children[-1])
             if Anchor._is_valid_anchor(anchor):
@@ -6,10 +6,10 @@ from lxml.etree import XPath
 from .abstract_strategy import AbstractStrategy
 from .anchor import Anchor
 from .hierarchy import Hierarchy
-from ..config.urls_parser import UrlsParser
-from ..helpers import to_json
-import json
-import hashlib
+from .object_id import ObjectId
+from .page_context import PageContext
+from .record import Record
+from .stop_content_matcher import StopContentMatcher
 
 
 class DefaultStrategy(AbstractStrategy):
@@ -17,76 +17,162 @@ class DefaultStrategy(AbstractStrategy):
     DefaultStrategy
     """
     dom = None
+    levels = ['lvl0', 'lvl1', 'lvl2', 'lvl3', 'lvl4', 'lvl5', 'lvl6']
 
     def __init__(self, config):
         super(DefaultStrategy, self).__init__(config)
-        self.levels = ['lvl0', 'lvl1', 'lvl2', 'lvl3', 'lvl4', 'lvl5', 'lvl6']
-        self.global_content = {}
         self.page_rank = {}
+        self.compiled_xpaths = {}
+        self._compile_selectors()
+        self.stop_content_matcher = StopContentMatcher(
+            config.stop_content) if len(config.stop_content) > 0 else None
+        self.get_object_id = ObjectId.get_function(config.object_id_mode)
+
+    def compile_xpath(self, path):
+        """Return the compiled XPath for a path, compiling it only once"""
+        compiled_xpath = self.compiled_xpaths.get(path)
+        if compiled_xpath is None:
+            compiled_xpath = XPath(path)
+            self.compiled_xpaths[path] = compiled_xpath
+
+        return compiled_xpath
+
+    def _compile_selectors(self):
+        """Compile upfront every XPath needed to extract records from a page"""
+        self.compile_xpath('//meta')
+        if len(self.config.selectors_exclude_xpath) > 0:
+            self.compile_xpath(self.config.selectors_exclude_xpath)
+
+        for selectors in list(self.config.selectors.values()):
+            self._compile_selectors_set(selectors)
+
+            selector_all = self._get_selector_all(
+                self._get_used_levels(selectors), selectors)
+            if len(selector_all) > 0:
+                self.compile_xpath(" | ".join(selector_all))
+
+    def _compile_selectors_set(self, selectors):
+        for level in list(selectors.keys()):
+            if len(selectors[level]['selector']) > 0:
+                self.compile_xpath(selectors[level]['selector'])
+
+            if 'attributes' in selectors[level]:
+                self._compile_selectors_set(selectors[level]['attributes'])
 
-    def select(self, path):
-        """Select an element in the current DOM using specified CSS selector"""
-        return XPath(path)(self.dom) if len(path) > 0 else []
+    def select(self, path, dom=None):
+        """Select an element in the DOM (the current one by default) using specified CSS selector"""
+        if dom is None:
+            dom = self.dom
+        return self.compile_xpath(path)(dom) if len(path) > 0 else []
 
     def get_records_from_response(self, response):
         """
         Main method called from the DocumentationSpider. Will be passed the HTTP
         response and will return a list of all records"""
+        return list(self.iter_records_from_response(response))
+
+    def iter_records_from_response(self, response):
+        """Yield the records of the response as they are extracted"""
+        # The body is only decoded once, if the stop content can't be
+        # searched in the raw bytes it is decoded for both
+        body = None
+        if self.stop_content_matcher is not None:
+            if not self.stop_content_matcher.can_search_bytes(
+                    response.encoding):
+                body = self.get_body(response)
+
+            if self._body_contains_stop_content(response, body):
+                return
 
-        if self._body_contains_stop_content(response):
-            return []
+        # The DOM only lives as long as the extraction of its records
+        dom = self.get_dom(response, body)
+        excluded = self.exclude_from_dom(dom)
 
-        self.dom = self.get_dom(response)
-        self.dom = self.remove_from_dom(self.dom,
-                                        self.config.selectors_exclude)
+        for record in self.iter_records_from_dom(response.url, dom, excluded):
+            yield record
+
+    def exclude_from_dom(self, dom):
+        """
+        Find the elements of selectors_exclude in one pass. They are removed
+        from the DOM or, in 'skip' mode, returned with their descendants to
+        be skipped while extracting, leaving the DOM untouched.
+        """
+        matches = self.select(self.config.selectors_exclude_xpath, dom)
 
-        records = self.get_records_from_dom(response.url)
+        if self.config.selectors_exclude_mode == 'skip':
+            return self.get_excluded_elements(matches)
 
-        return records
+        self.drop_elements(matches)
+        return None
 
-    def _update_hierarchy_with_global_content(self, hierarchy,
-                                              current_level_int):
+    @staticmethod
+    def _update_hierarchy_with_global_content(hierarchy, current_level_int,
+                                              global_content):
         for index in range(0, current_level_int + 1):
-            if 'lvl{}'.format(index) in self.global_content:
-                hierarchy['lvl{}'.format(index)] = self.global_content[
+            if 'lvl{}'.format(index) in global_content:
+                hierarchy['lvl{}'.format(index)] = global_content[
                     'lvl{}'.format(index)]
 
         return hierarchy
 
-    def _update_record_with_global_content(self, record, levels):
+    @staticmethod
+    def _update_record_with_global_content(record, levels, global_content):
         for level in levels:
             if 'lvl' not in level and level not in ['content', 'text']:
-                record[level] = self.global_content[level]
+                record[level] = global_content[level]
 
         return record
 
-    def get_records_from_dom(self, current_page_url=None):
+    def get_records_from_dom(self, current_page_url=None, dom=None,
+                             excluded=None):
+        return list(self.iter_records_from_dom(current_page_url, dom, excluded))
 
-        if self.dom is None:
+    def iter_records_from_dom(self, current_page_url=None, dom=None,
+                              excluded=None):
+        """
+        Yield the records of the DOM (the current one by default) one by one,
+        leaving out the excluded elements
+        """
+        if dom is None:
+            dom = self.dom
+
+        if dom is None:
             exit('DefaultStrategy.dom is not defined')
 
-        # Reset it to be able to have a clean instance when testing
-        self.global_content = {}
+        # Everything that only depends on the page is computed once
+        page = PageContext.build(current_page_url, dom,
+                                 self.select('//meta', dom),
+                                 self.config.start_urls_matcher, excluded)
 
         selectors = self.get_selectors_set(current_page_url)
         levels = self._get_used_levels(selectors)
 
-        # We get a big selector that matches all relevant nodes, in order
-        # But we also keep a list of all matches for each individual level
-        nodes_per_level = self._get_nodes_per_level(selectors, levels)
-        nodes = self._get_all_matching_nodes(levels, selectors)
-        self._get_nodes_per_global_level(selectors, levels)
+        nodes = self._get_nodes_with_level(selectors, levels, dom)
+        if len(page.excluded) > 0:
+            nodes = [(node, level) for node, level in nodes if
+                     not page.is_excluded(node)]
+        self._get_nodes_per_global_level(selectors, levels, page)
+
+        min_indexed_level = self.get_min_indexed_level_for_url(
+            current_page_url)
+        anchor_index = Anchor.get_anchor_index(dom, page.excluded)
+
+        # Attributes shared by every record of the page, applied after the
+        # camel copies
+        page_attributes = self._update_record_with_global_content(
+            {}, selectors, page.global_content)
+        page_attributes.update(page.meta_attributes)
+        if current_page_url is not None:
+            # Add variables to the record
+            for attr, value, url_without_variables in page.url_variables:
+                page_attributes['url_without_variables'] = url_without_variables
+                page_attributes[attr] = value
 
         # We keep the current hierarchy and anchor state between loops
         previous_hierarchy = self._generate_empty_hierarchy()
         anchors = self._generate_empty_hierarchy()
 
-        records = []
-
-        for position, node in enumerate(nodes):
-            current_level = self._get_level_of_node(node, nodes_per_level,
-                                                    levels)
-
+        for position, (node, current_level) in enumerate(nodes):
             # We copy the previous hierarchy, We override the current level, And set all levels after it to None
             hierarchy = previous_hierarchy.copy()
 
@@ -95,8 +181,8 @@ class DefaultStrategy(AbstractStrategy):
 
             if current_level != 'content':
                 hierarchy[current_level] = self._get_text_content_for_level(
-                    node, current_level, selectors)
-                anchors[current_level] = Anchor.get_anchor(node)
+                    node, current_level, selectors, page)
+                anchors[current_level] = Anchor.get_anchor(node, anchor_index)
 
                 for index in range(current_level_int + 1, 7):
                     hierarchy['lvl{}'.format(index)] = None
@@ -106,16 +192,16 @@ class DefaultStrategy(AbstractStrategy):
                 if self.config.only_content_level:
                     continue
 
-            if current_level_int < self.get_min_indexed_level_for_url(
-                    current_page_url):
+            if current_level_int < min_indexed_level:
                 continue
 
-            hierarchy = self._update_hierarchy_with_global_content(hierarchy,
-                                                                   current_level_int)
+            hierarchy = self._update_hierarchy_with_global_content(
+                hierarchy, current_level_int, page.global_content)
 
             # We only save content for the 'text' matches
             content = None if current_level != 'content' else self.get_text(
-                node, self.get_strip_chars(current_level, selectors))
+                node, self.get_strip_chars(current_level, selectors),
+                page.text_cache, page.excluded)
 
             if (
                     content is None or content == "") and current_level == 'content':
@@ -131,105 +217,71 @@ class DefaultStrategy(AbstractStrategy):
                                                              selectors,
                                                              self.levels)
 
-            # noinspection PyDictCreation
-            record = {
-                'anchor': self._get_closest_anchor(anchors),
-                'content': content,
-                'hierarchy': hierarchy,
-                'hierarchy_radio': Hierarchy.get_hierarchy_radio(hierarchy,
-                                                                 current_level,
-                                                                 levels),
-                'type': current_level,
-                'tags': UrlsParser.get_tags(current_page_url,
-                                            self.config.start_urls),
-                'weight': {
-                    'page_rank': UrlsParser.get_page_rank(current_page_url,
-                                                          self.config.start_urls),
-                    'level': self.get_level_weight(current_level),
-                    'position': position
-                },
-                'url': current_page_url,
-                'url_without_variables': current_page_url
-            }
-
-            extra_attributes = UrlsParser.get_extra_attributes(
-                current_page_url, self.config.start_urls)
-
-            for key in list(extra_attributes.keys()):
-                record[key] = extra_attributes[key]
-
-            record['hierarchy_camel'] = record['hierarchy'],
-            record['hierarchy_radio_camel'] = record['hierarchy_radio']
-            record['content_camel'] = record['content']
-
-            self._update_record_with_global_content(record, selectors)
-
-            # get meta data
-            for meta_node in self.select('//meta'):
-                name = meta_node.get('name')
-                content = meta_node.get('content')
-                if name and name.startswith('docsearch:') and content:
-                    name = name.replace('docsearch:', '')
-                    jsonized = to_json(content)
-                    if jsonized:
-                        record[name] = jsonized
-                    else:
-                        record[name] = content
-
-                    if name == "version":
-                        version = str(content)
-                        # Handle version as comma-separated tokens
-                        record[name] = [token.strip() for token in version.split(",")]
+            record = Record(
+                self._get_closest_anchor(anchors),
+                content,
+                hierarchy,
+                Hierarchy.get_hierarchy_radio(hierarchy, current_level, levels),
+                current_level,
+                page.tags,
+                page.page_rank,
+                self.get_level_weight(current_level),
+                position,
+                current_page_url,
+                page.extra_attributes,
+                page_attributes
+            )
 
             if current_page_url is not None:
-                # Add variables to the record
-                for attr, value, url_without_variables in UrlsParser.get_url_variables(
-                        current_page_url, self.config.start_urls):
-                    record['url_without_variables'] = url_without_variables
-                    record[attr] = value
-
-                record['url_without_anchor'] = record['url']
-                record['url'] = self._get_url_with_anchor(record['url'],
-                                                          record['anchor'])
-                record['url_without_variables'] = self._get_url_with_anchor(
-                    record['url_without_variables'], record['anchor'])
-                record['no_variables'] = record['url'] == record[
-                    'url_without_variables']
+                anchor = record['anchor']
+                url_without_variables = record['url_without_variables']
+                record.url_without_anchor = record['url']
+                record.url = self._get_url_with_anchor(record['url'], anchor)
+                record.url_without_variables = self._get_url_with_anchor(
+                    url_without_variables, anchor)
+                record.no_variables = record.url == \
+                    record.url_without_variables
 
             # Define our own ObjectID to enable proper analytics
-            hierarchy_to_hash = {lvl: x for lvl, x in hierarchy.items() if
-                                 x is not None}
-            raw_hash = hashlib.sha1(json.dumps(
-                {'hierarchy_to_hash': hierarchy_to_hash,
-                 'url': record['url'],
-                 'position': position}, sort_keys=True).encode('utf-8'))
-            digest_hash = raw_hash.hexdigest()
-            record['objectID'] = digest_hash
-            records.append(record)
-
-        return records
-
-    def _get_text_content_for_level(self, node, current_level, selectors):
+            record.objectID = self.get_object_id(hierarchy, record['url'],
+                                                 position)
+            yield record
+
+    def _get_nodes_with_level(self, selectors, levels, dom=None):
+        """Return every relevant node, in document order, with its level"""
+        # We get a big selector that matches all relevant nodes, in order
+        # But we also keep a list of all matches for each individual level
+        nodes_per_level = self._get_nodes_per_level(selectors, levels, dom)
+        level_of_node = self._get_level_index(nodes_per_level, levels)
+        nodes = self._get_all_matching_nodes(levels, selectors, dom)
+
+        return [(node, level_of_node.get(node)) for node in nodes]
+
+    def _get_text_content_for_level(self, node, current_level, selectors,
+                                    page):
         if 'attributes' in selectors[current_level]:
             attributes = {}
             for attribute_name in list(selectors[current_level][
                                            'attributes'].keys()):
-                matching_nodes = node.xpath(
+                matching_nodes = page.filter_excluded(self.compile_xpath(
                     selectors[current_level]['attributes'][attribute_name][
-                        'selector'])
+                        'selector'])(node))
                 attributes[attribute_name] = self.get_text_from_nodes(
                     matching_nodes,
                     self.get_strip_chars(attribute_name,
                                          selectors[current_level][
-                                             'attributes'])
+                                             'attributes']),
+                    page.text_cache,
+                    page.excluded
                 )
             return attributes
 
-        if current_level in self.global_content:
-            return self.global_content[current_level]
+        if current_level in page.global_content:
+            return page.global_content[current_level]
 
         return self.get_text(node,
-                             self.get_strip_chars(current_level, selectors))
+                             self.get_strip_chars(current_level, selectors),
+                             page.text_cache, page.excluded)
 
     @staticmethod
     def _get_closest_anchor(anchors):
@@ -255,13 +307,22 @@ class DefaultStrategy(AbstractStrategy):
         }
 
     @staticmethod
-    def _get_level_of_node(node, nodes_per_level, levels):
+    def _get_level_index(nodes_per_level, levels):
+        """
+        Map every matched node to its level, the first level wins when a node
+        is matched by several selectors. Elements are keyed by identity, string
+        results (Ex. xpath selector with text()) by value.
+        """
+        level_of_node = {}
         for level in levels:
-            if level in nodes_per_level:  # if it's global we won't have it
-                if node in nodes_per_level[level]:
-                    return level
+            if level not in nodes_per_level:  # if it's global we won't have it
+                continue
 
-        return None
+            for node in nodes_per_level[level]:
+                if node not in level_of_node:
+                    level_of_node[node] = level
+
+        return level_of_node
 
     @staticmethod
     def _handle_default_values(hierarchy, content, selectors, levels):
@@ -278,35 +339,37 @@ class DefaultStrategy(AbstractStrategy):
 
         return hierarchy, content
 
-    def _get_nodes_per_global_level(self, selectors, levels):
+    def _get_nodes_per_global_level(self, selectors, levels, page):
+        global_content = page.global_content
         for level in list(selectors.keys()):
             level_selector = selectors[level]
             if level not in levels or level_selector['global']:
-                matching_dom_nodes = self.select(level_selector['selector'])
-                self.global_content[level] = self.get_text_from_nodes(
+                matching_dom_nodes = page.filter_excluded(
+                    self.select(level_selector['selector'], page.dom))
+                global_content[level] = self.get_text_from_nodes(
                     matching_dom_nodes,
-                    self.get_strip_chars(level, selectors))
+                    self.get_strip_chars(level, selectors),
+                    page.text_cache, page.excluded)
 
-                if self.global_content[level] is None and level_selector[
+                if global_content[level] is None and level_selector[
                     'default_value'] is not None:
-                    self.global_content[level] = level_selector[
-                        'default_value']
+                    global_content[level] = level_selector['default_value']
 
-    def _get_nodes_per_level(self, selectors, levels):
+    def _get_nodes_per_level(self, selectors, levels, dom=None):
         nodes_per_level = {}
 
         for level in levels:
             level_selector = selectors[level]
-            matching_dom_nodes = self.select(level_selector['selector'])
+            matching_dom_nodes = self.select(level_selector['selector'], dom)
 
             if not level_selector['global']:
                 nodes_per_level[level] = matching_dom_nodes
 
         return nodes_per_level
 
-    def _get_all_matching_nodes(self, levels, selectors):
+    def _get_all_matching_nodes(self, levels, selectors, dom=None):
         return self.select(
-            " | ".join(self._get_selector_all(levels, selectors)))
+            " | ".join(self._get_selector_all(levels, selectors)), dom)
 
     @staticmethod
     def _get_selector_all(levels, selectors):
@@ -335,15 +398,15 @@ class DefaultStrategy(AbstractStrategy):
 
         return used_levels
 
-    def _body_contains_stop_content(self, response):
-        if len(self.config.stop_content) > 0:
-            body = self.get_body(response)
+    def _body_contains_stop_content(self, response, body=None):
+        """Search the decoded body if any, the raw bytes otherwise"""
+        if self.stop_content_matcher is None:
+            return False
 
-            for stop_content in self.config.stop_content:
-                if stop_content in body:
-                    return True
+        if body is None:
+            body = response.body
 
-        return False
+        return self.stop_content_matcher.search(body, response.encoding)
 
     def _get_url_with_anchor(self, current_page_url, anchor):
         if (
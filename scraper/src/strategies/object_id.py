@@ -0,0 +1,81 @@
+"""
+ObjectId
+Compute the objectID of a record from its hierarchy, URL and position
+"""
+
+import hashlib
+import json
+from json.encoder import encode_basestring_ascii
+
+MODES = ['compat', 'fast']
+
+# Levels of a hierarchy, in sort_keys order
+LEVELS = ['lvl0', 'lvl1', 'lvl2', 'lvl3', 'lvl4', 'lvl5', 'lvl6']
+LEVEL_KEYS = [(level, encode_basestring_ascii(level) + ': ') for level in
+              LEVELS]
+
+# Neither can be found in a text parsed by lxml
+SEPARATOR = '\x00'
+NONE = '\x01'
+
+
+class ObjectId:
+    """
+    compat: the SHA1 of json.dumps({'hierarchy_to_hash': ..., 'url': ...,
+    'position': ...}, sort_keys=True), written directly without building the
+    dict. IDs are the same as the ones of previous crawls.
+    fast: the SHA1 of the levels, URL and position joined in a fixed order.
+    IDs are different from the compat ones.
+    A hierarchy has the lvl0 to lvl6 keys, as built by the strategy.
+    """
+
+    @staticmethod
+    def encode_json(value):
+        """Same output as json.dumps(value, sort_keys=True)"""
+        if value.__class__ is str:
+            return encode_basestring_ascii(value)
+        if value.__class__ is int:
+            return str(value)
+        return json.dumps(value, sort_keys=True)
+
+    @staticmethod
+    def get_compat_hash_input(hierarchy, url, position):
+        encode_json = ObjectId.encode_json
+        levels = ', '.join(
+            [key + encode_json(hierarchy[level]) for level, key in LEVEL_KEYS
+             if hierarchy[level] is not None])
+
+        return '{"hierarchy_to_hash": {' + levels + '}, "position": ' + \
+               encode_json(position) + ', "url": ' + encode_json(url) + '}'
+
+    @staticmethod
+    def get_fast_hash_input(hierarchy, url, position):
+        fields = []
+        for level in LEVELS:
+            value = hierarchy[level]
+            if value is None:
+                value = NONE
+            elif value.__class__ is not str:
+                value = json.dumps(value, sort_keys=True)
+            fields.append(value)
+
+        fields.append(url if url is not None else NONE)
+        fields.append(str(position))
+
+        return SEPARATOR.join(fields)
+
+    @staticmethod
+    def get(hierarchy, url, position):
+        return hashlib.sha1(ObjectId.get_compat_hash_input(
+            hierarchy, url, position).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_fast(hierarchy, url, position):
+        return hashlib.sha1(ObjectId.get_fast_hash_input(
+            hierarchy, url, position).encode('utf-8',
+                                             'surrogatepass')).hexdigest()
+
+    @staticmethod
+    def get_function(mode):
+        """Return the objectID function of the object_id_mode"""
+        return ObjectId.get_fast if mode == 'fast' else ObjectId.get
@@ -0,0 +1,95 @@
+from ..helpers import to_json
+
+
+class PageContext:
+    """
+    State of the extraction of one page: its DOM, the values that only depend
+    on the page URL and DOM, computed once and stamped onto every record, and
+    the content gathered while extracting. Nothing is kept on the strategy, so
+    the DOM is freed with the context once the records are built.
+    """
+
+    def __init__(self, url, dom, meta_attributes, tags, page_rank,
+                 extra_attributes, url_variables, excluded=None):
+        self.url = url
+        self.dom = dom
+        # Elements of selectors_exclude left in the DOM and skipped instead
+        self.excluded = excluded if excluded is not None else set()
+        self.meta_attributes = meta_attributes
+        self.tags = tags
+        self.page_rank = page_rank
+        self.extra_attributes = extra_attributes
+        self.url_variables = url_variables
+
+        # Text of the global selectors, by level
+        self.global_content = {}
+        # Text of the nodes of the page, by (node, strip_chars)
+        self.text_cache = {}
+
+    def is_excluded(self, node):
+        """
+        Whether the node is in an excluded subtree. Strings returned by
+        XPath (Ex. text()) are excluded with the element holding them.
+        """
+        if not isinstance(node, str):
+            return node in self.excluded
+
+        get_parent = getattr(node, 'getparent', None)
+        element = get_parent() if get_parent is not None else None
+        # The tail of an element is part of its parent
+        if element is not None and node.is_tail:
+            element = element.getparent()
+
+        return element is not None and element in self.excluded
+
+    def filter_excluded(self, nodes):
+        """Leave the excluded nodes out of an XPath result"""
+        if len(self.excluded) == 0 or not isinstance(nodes, list):
+            return nodes
+
+        return [node for node in nodes if not self.is_excluded(node)]
+
+    @staticmethod
+    def get_meta_attributes(meta_nodes):
+        """Return the docsearch:* meta values of the page, in DOM order"""
+        meta_attributes = {}
+        for meta_node in meta_nodes:
+            name = meta_node.get('name')
+            content = meta_node.get('content')
+            if name and name.startswith('docsearch:') and content:
+                name = name.replace('docsearch:', '')
+                jsonized = to_json(content)
+                if jsonized:
+                    meta_attributes[name] = jsonized
+                else:
+                    meta_attributes[name] = content
+
+                if name == "version":
+                    version = str(content)
+                    # Handle version as comma-separated tokens
+                    meta_attributes[name] = [token.strip() for token in
+                                             version.split(",")]
+
+        return meta_attributes
+
+    @staticmethod
+    def build(url, dom, meta_nodes, start_urls_matcher, excluded=None):
+        if excluded:
+            meta_nodes = [meta_node for meta_node in meta_nodes if
+                          meta_node not in excluded]
+
+        if url is None:
+            return PageContext(url, dom,
+                               PageContext.get_meta_attributes(meta_nodes),
+                               [], 0, {}, [], excluded)
+
+        return PageContext(
+            url,
+            dom,
+            PageContext.get_meta_attributes(meta_nodes),
+            start_urls_matcher.get_tags(url),
+            start_urls_matcher.get_page_rank(url),
+            start_urls_matcher.get_extra_attributes(url),
+            list(start_urls_matcher.get_url_variables(url)),
+            excluded
+        )
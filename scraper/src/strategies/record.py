@@ -0,0 +1,158 @@
+"""
+Record
+A record extracted from a page, as light as possible in memory
+"""
+
+from collections.abc import Mapping
+
+# Keys of the fields, before the page attributes are applied
+FIELD_KEYS = ['anchor', 'content', 'hierarchy', 'hierarchy_radio', 'type',
+              'tags', 'weight', 'url', 'url_without_variables']
+
+# Keys set once the page attributes are applied, when the page has an URL
+URL_KEYS = ['url_without_anchor', 'url', 'url_without_variables',
+            'no_variables']
+
+
+class Record(Mapping):
+    """
+    Read-only mapping with the keys and values of the dict the strategy used
+    to build. Only the fields of the record are stored: the attributes shared
+    by every record of the page (extra_attributes, global selectors, meta,
+    URL variables) are the same dicts for all of them, and the weight and
+    camel copies are only built by to_dict.
+    """
+    __slots__ = ['anchor', 'content', 'hierarchy', 'hierarchy_radio', 'type',
+                 'tags', 'page_rank', 'level_weight', 'position', 'url',
+                 'url_without_variables', 'url_without_anchor',
+                 'no_variables', 'objectID', 'extra_attributes',
+                 'page_attributes']
+
+    def __init__(self, anchor, content, hierarchy, hierarchy_radio, type,
+                 tags, page_rank, level_weight, position, url,
+                 extra_attributes, page_attributes):
+        self.anchor = anchor
+        self.content = content
+        self.hierarchy = hierarchy
+        self.hierarchy_radio = hierarchy_radio
+        self.type = type
+        self.tags = tags
+        self.page_rank = page_rank
+        self.level_weight = level_weight
+        self.position = position
+        self.url = url
+        self.url_without_variables = url
+        # Set with no_variables, once the anchor is added to the URLs
+        self.url_without_anchor = None
+        self.no_variables = None
+        self.objectID = None
+        # Applied over the fields before the camel copies are made
+        self.extra_attributes = extra_attributes
+        # Applied after the camel copies
+        self.page_attributes = page_attributes
+
+    def _get_fields(self):
+        return {
+            'anchor': self.anchor,
+            'content': self.content,
+            'hierarchy': self.hierarchy,
+            'hierarchy_radio': self.hierarchy_radio,
+            'type': self.type,
+            'tags': self.tags,
+            'weight': {
+                'page_rank': self.page_rank,
+                'level': self.level_weight,
+                'position': self.position
+            },
+            'url': self.url,
+            'url_without_variables': self.url_without_variables
+        }
+
+    def to_dict(self):
+        """Return the record as a new dict, keys in the same order as always"""
+        record = self._get_fields()
+        record.update(self.extra_attributes)
+
+        record['hierarchy_camel'] = record['hierarchy'],
+        record['hierarchy_radio_camel'] = record['hierarchy_radio']
+        record['content_camel'] = record['content']
+
+        record.update(self.page_attributes)
+
+        if self.no_variables is not None:
+            record['url_without_anchor'] = self.url_without_anchor
+            record['url'] = self.url
+            record['url_without_variables'] = self.url_without_variables
+            record['no_variables'] = self.no_variables
+
+        if self.objectID is not None:
+            record['objectID'] = self.objectID
+
+        return record
+
+    @staticmethod
+    def as_dict(record):
+        """Records can either be a Record or a dict (Ex. extra_records)"""
+        if isinstance(record, Record):
+            return record.to_dict()
+        return record
+
+    def _get_before_page_attributes(self, key):
+        if key in self.extra_attributes:
+            return self.extra_attributes[key]
+
+        if key == 'weight':
+            return self._get_fields()[key]
+        if key in FIELD_KEYS:
+            return getattr(self, key)
+
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        if key == 'objectID' and self.objectID is not None:
+            return self.objectID
+
+        if self.no_variables is not None and key in URL_KEYS:
+            return getattr(self, key)
+
+        if key in self.page_attributes:
+            return self.page_attributes[key]
+
+        if key == 'hierarchy_camel':
+            return self._get_before_page_attributes('hierarchy'),
+        if key == 'hierarchy_radio_camel':
+            return self._get_before_page_attributes('hierarchy_radio')
+        if key == 'content_camel':
+            return self._get_before_page_attributes('content')
+
+        return self._get_before_page_attributes(key)
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __contains__(self, key):
+        return key in self.to_dict()
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == dict(Record.as_dict(other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return 'Record({!r})'.format(self.to_dict())
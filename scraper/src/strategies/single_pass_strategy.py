@@ -0,0 +1,93 @@
+"""
+Single Pass Strategy
+"""
+
+from lxml.etree import iterwalk
+from .default_strategy import DefaultStrategy
+
+
+class SinglePassStrategy(DefaultStrategy):
+    """
+    Same records as the DefaultStrategy, but the matching nodes are put back
+    in document order with a single traversal of the page instead of
+    evaluating the union of all the level selectors a second time.
+    """
+
+    def _get_nodes_with_level(self, selectors, levels, dom=None):
+        if dom is None:
+            dom = self.dom
+
+        nodes_per_level = self._get_nodes_per_level(selectors, levels, dom)
+        level_of_node = self._get_level_index(nodes_per_level, levels)
+
+        nodes_to_sort = [nodes_per_level[level] for level in levels if
+                         level in nodes_per_level and len(
+                             nodes_per_level[level]) > 0]
+
+        if len(nodes_to_sort) == 0:
+            return []
+
+        if len(nodes_to_sort) == 1:
+            # A single XPath result is already in document order
+            nodes = nodes_to_sort[0]
+        else:
+            try:
+                nodes = self._sort_in_document_order(nodes_to_sort, dom)
+            except KeyError:
+                # Matches outside of the root element (Ex. a comment before
+                # <html>) are left to the union selector
+                return super(SinglePassStrategy, self)._get_nodes_with_level(
+                    selectors, levels, dom)
+
+        return [(node, level_of_node.get(node)) for node in nodes]
+
+    def _sort_in_document_order(self, nodes_to_sort, dom):
+        starts, ends = self._get_document_positions(dom)
+
+        nodes_by_position = {}
+        for nodes in nodes_to_sort:
+            for node in nodes:
+                position = self._get_document_position(node, starts, ends)
+                # A node matched by several selectors is only kept once
+                if position not in nodes_by_position:
+                    nodes_by_position[position] = node
+
+        return [nodes_by_position[position] for position in
+                sorted(nodes_by_position)]
+
+    @staticmethod
+    def _get_document_positions(dom):
+        """
+        Walk the whole document once and return the position of the start
+        and of the end of each node
+        """
+        starts = {}
+        ends = {}
+
+        events = iterwalk(dom.getroottree().getroot(),
+                          events=('start', 'end'))
+        for position, (event, node) in enumerate(events):
+            if event == 'start':
+                starts[node] = position
+            else:
+                ends[node] = position
+
+        return starts, ends
+
+    @staticmethod
+    def _get_document_position(node, starts, ends):
+        """
+        Return a sortable position, matching the XPath document order.
+        Attributes and text come right after the start of their element, a
+        tail right after the end of its element.
+        """
+        if isinstance(node, str):
+            parent = node.getparent()
+            if node.is_tail:
+                return ends[parent], 0, 0
+            if node.is_attribute:
+                return starts[parent], 1, list(parent.attrib.keys()).index(
+                    node.attrname)
+            return starts[parent], 2, 0
+
+        return starts[node], 0, 0
@@ -0,0 +1,81 @@
+"""
+StopContentMatcher
+Look for the stop_content entries in the raw body of a page, without decoding
+it first
+"""
+
+import codecs
+import re
+import sys
+
+# A pattern found in the raw bytes of these encodings is always found in the
+# decoded text: no character starts in the middle of another one
+BYTE_SAFE_ENCODINGS = ['utf-8', 'ascii', 'iso8859-1']
+
+
+class StopContentMatcher:
+    """
+    All the stop_content entries are searched at once, with a single
+    alternation regex compiled once per response encoding.
+    """
+
+    def __init__(self, stop_content):
+        self.stop_content = stop_content
+        self.text_pattern = self._compile(
+            [re.escape(content) for content in stop_content], '|')
+        # Bytes pattern by encoding, None when no entry can be encoded
+        self.bytes_patterns = {}
+        # Whether the raw bytes can be searched, by encoding
+        self.byte_safe = {}
+
+    @staticmethod
+    def _compile(escaped_patterns, separator):
+        if len(escaped_patterns) == 0:
+            return None
+
+        return re.compile(separator.join(escaped_patterns))
+
+    def can_search_bytes(self, encoding):
+        """
+        Whether the raw bytes can be searched for that encoding: it is either
+        UTF-8 or a single byte encoding (decoded with a charmap table).
+        Multi byte and stateful encodings (Ex. UTF-16, Shift_JIS, ISO-2022-JP)
+        could match across characters.
+        """
+        if encoding not in self.byte_safe:
+            try:
+                codec = codecs.lookup(encoding)
+            except (LookupError, TypeError):
+                self.byte_safe[encoding] = False
+                return False
+
+            module = sys.modules.get(getattr(codec.decode, '__module__', None))
+            self.byte_safe[encoding] = codec.name in BYTE_SAFE_ENCODINGS or \
+                hasattr(module, 'decoding_table')
+
+        return self.byte_safe[encoding]
+
+    def _get_bytes_pattern(self, encoding):
+        if encoding not in self.bytes_patterns:
+            escaped_patterns = []
+            for content in self.stop_content:
+                try:
+                    escaped_patterns.append(
+                        re.escape(content.encode(encoding)))
+                except (UnicodeError, LookupError):
+                    # Not in the decoded text if it can't be encoded
+                    continue
+
+            self.bytes_patterns[encoding] = self._compile(escaped_patterns,
+                                                          b'|')
+
+        return self.bytes_patterns[encoding]
+
+    def search(self, body, encoding='utf-8'):
+        """Whether the body, decoded text or raw bytes, contains an entry"""
+        if isinstance(body, str):
+            pattern = self.text_pattern
+        else:
+            pattern = self._get_bytes_pattern(encoding)
+
+        return pattern is not None and pattern.search(body) is not None
@@ -0,0 +1,41 @@
+# coding: utf-8
+from ..documentation_spider import DocumentationSpider
+
+
+class AlgoliaHelperMock:
+    """Keep the records in memory instead of sending them to Algolia"""
+    instances = []
+
+    def __init__(self, app_id=None, api_key=None, index_name=None,
+                 index_name_tmp=None, settings=None, *args, **kwargs):
+        self.settings = settings
+        self.added = []
+        self.urls = []
+        self.committed = False
+        AlgoliaHelperMock.instances.append(self)
+
+    def add_records(self, records, url, from_sitemap):
+        records = list(records)
+        self.added.extend(records)
+        self.urls.append(url)
+        return len(records)
+
+    def commit_tmp_index(self):
+        self.committed = True
+
+
+def get_spider(**attributes):
+    """DocumentationSpider without config, indexing in an AlgoliaHelperMock"""
+    spider = DocumentationSpider.__new__(DocumentationSpider)
+    spider.successfully_indexed = 0
+    spider.validator_cache = None
+    spider.parse_pool = None
+    spider.strategy = None
+    spider.js_render = False
+    spider.algolia_helper = AlgoliaHelperMock()
+    spider.nb_hits_max = 0
+
+    for key, value in attributes.items():
+        setattr(spider, key, value)
+
+    return spider
@@ -0,0 +1,37 @@
+# coding: utf-8
+from ...algolia_helper import AlgoliaHelper
+from ...batch_writer import BatchWriter
+from ...output_sink import AlgoliaSink
+
+
+def get_helper(sent):
+    helper = AlgoliaHelper.__new__(AlgoliaHelper)
+    helper.record_hash_store = None
+    helper.output_sink = AlgoliaSink.__new__(AlgoliaSink)
+    helper.output_sink.batch_writer = BatchWriter(sent.append, batch_size=1,
+                                                  flush_interval=0,
+                                                  concurrency=1)
+    return helper
+
+
+class TestAddRecords:
+    def test_records_are_sent_as_they_are_produced(self):
+        # Given
+        sent = []
+        helper = get_helper(sent)
+
+        def records():
+            for i in range(3):
+                yield {'objectID': str(i)}
+                # The previous records are already in the writer
+                helper.output_sink.batch_writer.drain()
+                assert len(sent) == i + 1
+
+        # When
+        actual = helper.add_records(records(), 'http://test.com/', False)
+
+        # Then
+        helper.output_sink.batch_writer.close()
+        assert actual == 3
+        assert sent == [[{'objectID': '0'}], [{'objectID': '1'}],
+                        [{'objectID': '2'}]]
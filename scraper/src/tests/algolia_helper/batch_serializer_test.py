@@ -0,0 +1,114 @@
+# coding: utf-8
+import gzip
+import json
+
+from algoliasearch.search_client import SearchClient
+
+from ...batch_serializer import BatchSerializer, ENCODERS
+from ...batch_writer import BatchWriter
+from ...strategies.record import Record
+
+
+class RecordingTransporter:
+    def __init__(self):
+        self.requests = []
+
+    def retry(self, hosts, request, relative_url):
+        self.requests.append((hosts, request, relative_url))
+        return {'taskID': 1}
+
+
+def get_record():
+    record = Record('anchor', u'Foo "bar" é / 日本', {'lvl0': 'Bar'},
+                    {'lvl0': 'Bar'}, 'content', ['tag'], 0, 0, 0,
+                    'http://foo.com/', {}, {'big': 2 ** 70})
+    record.objectID = 'a'
+    return record
+
+
+def get_index(transporter):
+    index = SearchClient.create('app_id', 'api_key').init_index('index_tmp')
+    index._transporter = transporter
+    return index
+
+
+class TestBatchSerializer:
+    def test_every_encoder_gives_the_same_records(self):
+        for encoder in ENCODERS:
+            # Given
+            serializer = BatchSerializer(encoder, compress=False)
+
+            # When
+            actual = serializer.get_batch_body([
+                serializer.serialize_record(get_record()),
+                serializer.serialize_record({'objectID': 'b'})])
+
+            # Then
+            assert json.loads(actual.decode('utf-8')) == {
+                'requests': [
+                    {'action': 'updateObject',
+                     'body': json.loads(json.dumps(get_record().to_dict()))},
+                    {'action': 'updateObject', 'body': {'objectID': 'b'}}]}
+
+    def test_fastest_encoder_is_used(self):
+        # When
+        actual = BatchSerializer()
+
+        # Then
+        if 'orjson' in ENCODERS:
+            assert actual.encoder == 'orjson'
+        elif 'ujson' in ENCODERS:
+            assert actual.encoder == 'ujson'
+        else:
+            assert actual.encoder == 'json'
+
+    def test_batch_is_sent_gzipped(self):
+        # Given
+        transporter = RecordingTransporter()
+        index = get_index(transporter)
+        serializer = BatchSerializer()
+        records = [serializer.serialize_record(get_record())]
+
+        # When
+        serializer.send_batch(index, records)
+
+        # Then
+        hosts, request, relative_url = transporter.requests[0]
+        assert relative_url == '1/indexes/index_tmp/batch?'
+        assert request.verb == 'POST'
+        assert request.headers['Content-Encoding'] == 'gzip'
+        assert request.headers['X-Algolia-API-Key'] == 'api_key'
+        assert json.loads(gzip.decompress(request.data_as_string))[
+                   'requests'][0]['body']['objectID'] == 'a'
+        assert len(hosts) > 0
+
+    def test_batch_can_be_sent_uncompressed(self):
+        # Given
+        transporter = RecordingTransporter()
+        serializer = BatchSerializer('json', compress=False)
+
+        # When
+        serializer.send_batch(get_index(transporter),
+                              [serializer.serialize_record({'objectID': 'b'})])
+
+        # Then
+        request = transporter.requests[0][1]
+        assert 'Content-Encoding' not in request.headers
+        assert request.data_as_string == \
+               b'{"requests":[{"action":"updateObject","body":{"objectID":"b"}}]}'
+
+    def test_batch_writer_sends_serialized_records(self):
+        # Given
+        batches = []
+        serializer = BatchSerializer('json')
+        writer = BatchWriter(batches.append, batch_size=2, flush_interval=0,
+                             serialize=serializer.serialize_record)
+
+        # When
+        writer.add({'objectID': 'a'})
+        writer.add(get_record())
+        writer.close()
+
+        # Then
+        assert batches == [[serializer.serialize_record({'objectID': 'a'}),
+                            serializer.serialize_record(get_record())]]
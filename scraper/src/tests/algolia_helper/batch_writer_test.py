@@ -0,0 +1,142 @@
+# coding: utf-8
+import threading
+import time
+
+import pytest
+
+from ...batch_writer import BatchWriter
+from ...strategies.record import Record
+
+
+class RecordingSender:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, batch):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append(batch)
+
+
+class TestBatchWriter:
+    def test_records_are_sent_by_batch_size(self):
+        # Given
+        sender = RecordingSender()
+        writer = BatchWriter(sender, batch_size=2, flush_interval=0)
+
+        # When
+        for i in range(0, 5):
+            writer.add({'objectID': i})
+        writer.close()
+
+        # Then
+        assert sorted(len(batch) for batch in sender.batches) == [1, 2, 2]
+        assert sorted(record['objectID'] for batch in sender.batches
+                      for record in batch) == [0, 1, 2, 3, 4]
+
+    def test_records_are_sent_by_batch_bytes(self):
+        # Given
+        sender = RecordingSender()
+        writer = BatchWriter(sender, batch_max_bytes=50, flush_interval=0)
+
+        # When
+        writer.add({'content': 'a' * 40})
+        writer.add({'content': 'b' * 40})
+        writer.drain()
+
+        # Then
+        assert len(sender.batches) == 2
+
+    def test_records_are_flushed_after_interval(self):
+        # Given
+        sender = RecordingSender()
+        writer = BatchWriter(sender, flush_interval=0.1)
+
+        # When
+        writer.add({'objectID': 1})
+        time.sleep(0.5)
+
+        # Then
+        assert sender.batches == [[{'objectID': 1}]]
+        writer.close()
+
+    def test_several_batches_in_flight(self):
+        # Given
+        sender = RecordingSender(delay=0.2)
+        writer = BatchWriter(sender, batch_size=1, flush_interval=0,
+                             concurrency=4)
+
+        # When
+        start = time.time()
+        for i in range(0, 4):
+            writer.add({'objectID': i})
+        writer.close()
+
+        # Then
+        assert len(sender.batches) == 4
+        assert time.time() - start < 0.6
+
+    def test_drain_raises_send_errors(self):
+        # Given
+        def failing_sender(batch):
+            raise ValueError('Algolia is down')
+
+        writer = BatchWriter(failing_sender, flush_interval=0)
+        writer.add({'objectID': 1})
+
+        # When / Then
+        with pytest.raises(ValueError):
+            writer.close()
+
+    def test_close_waits_for_the_batch_of_the_flusher(self):
+        # Given
+        release = threading.Event()
+        sender = RecordingSender()
+
+        def slow_sender(batch):
+            release.wait()
+            if batch == [{'objectID': 'late'}]:
+                raise ValueError('Algolia is down')
+            sender(batch)
+
+        # One batch sending, one waiting: the flusher waits for a slot
+        writer = BatchWriter(slow_sender, batch_size=2, flush_interval=0.01,
+                             concurrency=1)
+        for i in range(0, 4):
+            writer.add({'objectID': i})
+        writer.add({'objectID': 'late'})
+        releaser = threading.Timer(0.1, release.set)
+        try:
+            deadline = time.time() + 5
+            while writer.nb_pending == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert writer.nb_pending == 1
+            releaser.start()
+
+            # When / Then
+            with pytest.raises(ValueError):
+                writer.close()
+        finally:
+            # The senders never stay blocked, even when the test fails
+            release.set()
+        assert sender.batches == [[{'objectID': 0}, {'objectID': 1}],
+                                  [{'objectID': 2}, {'objectID': 3}]]
+
+    def test_records_are_sent_as_dicts(self):
+        # Given
+        sender = RecordingSender()
+        writer = BatchWriter(sender, batch_size=2, flush_interval=0)
+        record = Record('anchor', 'Foo', {'lvl0': 'Bar'}, {'lvl0': 'Bar'},
+                        'content', [], 0, 0, 0, None, {}, {})
+        record.objectID = 'a'
+
+        # When
+        writer.add(record)
+        writer.add({'objectID': 'b'})
+        writer.close()
+
+        # Then
+        assert sender.batches == [[record.to_dict(), {'objectID': 'b'}]]
+        assert type(sender.batches[0][0]) is dict
@@ -0,0 +1,188 @@
+# coding: utf-8
+import gzip
+import json
+import os
+
+import pytest
+from algoliasearch.search_client import SearchClient
+
+from ..abstract import get_spider
+from ...algolia_helper import AlgoliaHelper
+from ...output_sink import JsonlSink
+from ...strategies.record import Record
+
+
+def read_lines(path):
+    open_file = gzip.open if path.endswith('.gz') else open
+    with open_file(path, 'rb') as f:
+        return [json.loads(line.decode('utf-8')) for line in f]
+
+
+class TestJsonlSink:
+    def test_one_record_per_line(self, tmpdir):
+        # Given
+        sink = JsonlSink(str(tmpdir))
+        record = Record('anchor', u'Foo é', {'lvl0': 'Bar'}, {'lvl0': 'Bar'},
+                        'content', [], 0, 0, 0, 'http://foo.com/', {}, {})
+        record.objectID = 'a'
+
+        # When
+        sink.add(record)
+        sink.add({'objectID': 'b'})
+        sink.close()
+
+        # Then
+        assert sorted(os.listdir(str(tmpdir))) == ['manifest.json',
+                                                   'records-00000.jsonl']
+        assert read_lines(str(tmpdir.join('records-00000.jsonl'))) == [
+            json.loads(json.dumps(record.to_dict())), {'objectID': 'b'}]
+
+    def test_files_are_rotated(self, tmpdir):
+        # Given
+        line_bytes = len(b'{"objectID":"0"}\n')
+        sink = JsonlSink(str(tmpdir), max_bytes=2 * line_bytes)
+
+        # When
+        for i in range(5):
+            sink.add({'objectID': str(i)})
+        sink.close()
+
+        # Then
+        assert sorted(os.listdir(str(tmpdir))) == [
+            'manifest.json', 'records-00000.jsonl', 'records-00001.jsonl',
+            'records-00002.jsonl']
+        assert [read_lines(path) for path in sink.paths] == [
+            [{'objectID': '0'}, {'objectID': '1'}],
+            [{'objectID': '2'}, {'objectID': '3'}],
+            [{'objectID': '4'}]]
+        assert sink.get_report() == '3 files in ' + str(tmpdir)
+
+    def test_files_are_gzipped(self, tmpdir):
+        # Given
+        sink = JsonlSink(str(tmpdir.join('output')), compress=True)
+
+        # When
+        sink.add({'objectID': 'a'})
+        sink.close()
+
+        # Then
+        path = str(tmpdir.join('output', 'records-00000.jsonl.gz'))
+        assert sink.paths == [path]
+        assert read_lines(path) == [{'objectID': 'a'}]
+
+    def test_files_of_a_previous_run_are_removed(self, tmpdir):
+        # Given
+        line_bytes = len(b'{"objectID":"0"}\n')
+        previous = JsonlSink(str(tmpdir), max_bytes=line_bytes)
+        for i in range(4):
+            previous.add({'objectID': str(i)})
+        previous.close()
+        tmpdir.join('notes.txt').write('kept')
+
+        # When
+        sink = JsonlSink(str(tmpdir), max_bytes=line_bytes)
+        removed = sorted(os.listdir(str(tmpdir)))
+        for i in range(2):
+            sink.add({'objectID': str(i)})
+        sink.close()
+
+        # Then
+        assert removed == ['notes.txt']
+        assert sorted(os.listdir(str(tmpdir))) == [
+            'manifest.json', 'notes.txt', 'records-00000.jsonl',
+            'records-00001.jsonl']
+        assert json.loads(tmpdir.join('manifest.json').read()) == {
+            'files': ['records-00000.jsonl', 'records-00001.jsonl'],
+            'nb_records': 2}
+
+    def test_algolia_is_not_used(self, tmpdir, monkeypatch):
+        # Given
+        def create(*args):
+            raise AssertionError('Algolia should not be used')
+
+        monkeypatch.setattr(SearchClient, 'create', create)
+        helper = AlgoliaHelper(None, None, 'test', 'test_tmp', {}, [], True,
+                               output_sink=JsonlSink(str(tmpdir)))
+
+        # When
+        helper.add_records([{'objectID': 'a'}], 'http://test.com/', False)
+        helper.add_synonyms({'a': {'objectID': 'a'}})
+        helper.commit_tmp_index()
+
+        # Then
+        assert read_lines(str(tmpdir.join('records-00000.jsonl'))) == [
+            {'objectID': 'a'}]
+
+    def test_written_records_are_read_in_order(self, tmpdir):
+        # Given
+        line_bytes = len(b'{"objectID":"0"}\n')
+        sink = JsonlSink(str(tmpdir), max_bytes=line_bytes, compress=True)
+        for i in range(12):
+            sink.add({'objectID': str(i)})
+        sink.close()
+
+        # When
+        paths = JsonlSink.get_paths(str(tmpdir))
+        actual = [record for path in paths for record in JsonlSink.read(path)]
+
+        # Then
+        assert paths == sink.paths
+        assert actual == [{'objectID': str(i)} for i in range(12)]
+
+    def test_only_the_files_of_the_last_run_are_read(self, tmpdir):
+        # Given
+        line_bytes = len(b'{"objectID":"0"}\n')
+        sink = JsonlSink(str(tmpdir), max_bytes=line_bytes)
+        sink.add({'objectID': '0'})
+        sink.close()
+        # Ex. copied from another run
+        tmpdir.join('records-00001.jsonl').write('{"objectID":"stale"}\n')
+
+        # When
+        actual = JsonlSink.get_paths(str(tmpdir))
+
+        # Then
+        assert actual == [str(tmpdir.join('records-00000.jsonl'))]
+
+    def test_interrupted_run_is_not_read(self, tmpdir):
+        # Given
+        sink = JsonlSink(str(tmpdir))
+        sink.add({'objectID': '0'})
+
+        # When / Then
+        with pytest.raises(Exception, match='manifest.json'):
+            JsonlSink.get_paths(str(tmpdir))
+
+    def test_a_single_file_can_be_read(self, tmpdir):
+        # Given
+        path = str(tmpdir.join('dump.jsonl'))
+        with open(path, 'wb') as f:
+            f.write(b'{"objectID":"a"}\n\n{"objectID":"b"}\n')
+
+        # When
+        paths = JsonlSink.get_paths(path)
+
+        # Then
+        assert paths == [path]
+        assert list(JsonlSink.read(path)) == [{'objectID': 'a'},
+                                              {'objectID': 'b'}]
+
+    def test_removed_files_are_not_deleted_from_the_index(self, tmpdir,
+                                                          monkeypatch):
+        # Given
+        # remove_records prints the errors instead of raising them
+        created = []
+        monkeypatch.setattr(SearchClient, 'create',
+                            lambda *args: created.append(args))
+        spider = get_spider(
+            algolia_helper=AlgoliaHelper(None, None, 'test', 'test_tmp', {}, [],
+                                         True,
+                                         output_sink=JsonlSink(str(tmpdir))),
+            app_id='app_id', api_key='api_key', index_name='test',
+            docs_to_remove=[{'filename': 'foo', 'language': 'en'}])
+
+        # When
+        spider.remove_records()
+
+        # Then
+        assert created == []
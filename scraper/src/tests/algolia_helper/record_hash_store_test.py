@@ -0,0 +1,77 @@
+# coding: utf-8
+from ...record_hash_store import RecordHashStore
+from ...strategies.record import Record
+
+
+def crawl(path, records):
+    store = RecordHashStore(path)
+    sent = [record['objectID'] for record in records if
+            store.has_changed(record)]
+    vanished = store.get_vanished_object_ids()
+    store.forget_vanished()
+    store.save()
+
+    return store, sent, vanished
+
+
+class TestRecordHashStore:
+    def test_only_changed_records_are_sent(self, tmpdir):
+        # Given
+        path = str(tmpdir.join('hashes.sqlite'))
+        crawl(path, [
+            {'objectID': 'a', 'content': 'Foo'},
+            {'objectID': 'b', 'content': 'Bar'},
+            {'objectID': 'c', 'content': 'Baz'},
+        ])
+
+        # When
+        store, sent, vanished = crawl(path, [
+            {'objectID': 'a', 'content': 'Foo'},
+            {'objectID': 'b', 'content': 'Bar updated'},
+            {'objectID': 'd', 'content': 'New'},
+        ])
+
+        # Then
+        assert sent == ['b', 'd']
+        assert vanished == ['c']
+        assert store.get_report() == '1 added, 1 changed, 1 unchanged, 1 deleted'
+
+    def test_nothing_is_remembered_without_save(self, tmpdir):
+        # Given
+        path = str(tmpdir.join('hashes.sqlite'))
+        store = RecordHashStore(path)
+        store.has_changed({'objectID': 'a', 'content': 'Foo'})
+        store.connection.close()
+
+        # When
+        sent = crawl(path, [
+            {'objectID': 'a', 'content': 'Foo'},
+        ])[1]
+
+        # Then
+        assert sent == ['a']
+
+    def test_records_without_object_id_are_always_sent(self, tmpdir):
+        # Given
+        store = RecordHashStore(str(tmpdir.join('hashes.sqlite')))
+        record = {'content': 'Foo'}
+
+        # When
+        store.has_changed(record)
+        actual = store.has_changed(record)
+
+        # Then
+        assert actual is True
+        assert store.get_vanished_object_ids() == []
+
+    def test_record_digest_is_the_dict_one(self):
+        # Given
+        record = Record('anchor', 'Foo', {'lvl0': 'Bar'}, {'lvl0': 'Bar'},
+                        'content', [], 0, 0, 0, None, {}, {'lang': 'en'})
+        record.objectID = 'a'
+
+        # When
+        actual = RecordHashStore.get_digest(record)
+
+        # Then
+        assert actual == RecordHashStore.get_digest(record.to_dict())
@@ -0,0 +1,38 @@
+# coding: utf-8
+import json
+
+from ... import index
+from ..abstract import AlgoliaHelperMock
+from ...output_sink import JsonlSink
+
+
+class TestReplayRecords:
+    def test_records_of_the_last_run_are_sent(self, tmpdir, monkeypatch):
+        # Given
+        monkeypatch.setattr(index, 'AlgoliaHelper', AlgoliaHelperMock)
+        AlgoliaHelperMock.instances = []
+        line_bytes = len(b'{"objectID":"0"}\n')
+        previous = JsonlSink(str(tmpdir), max_bytes=line_bytes)
+        for i in range(4):
+            previous.add({'objectID': 'previous {}'.format(i)})
+        previous.close()
+        sink = JsonlSink(str(tmpdir), max_bytes=line_bytes)
+        for i in range(2):
+            sink.add({'objectID': str(i)})
+        sink.close()
+        config = json.dumps({
+            'index_name': 'test',
+            'start_urls': ['http://test.com/'],
+            'selectors': {'lvl0': 'h1', 'lvl1': 'h2', 'content': 'p'}
+        })
+
+        # When
+        index.replay_records(config, str(tmpdir))
+
+        # Then
+        helper = AlgoliaHelperMock.instances[0]
+        assert helper.added == [{'objectID': '0'}, {'objectID': '1'}]
+        assert helper.committed
+        assert helper.settings['searchableAttributes'][:2] == [
+            'unordered(hierarchy_radio_camel.lvl0)',
+            'unordered(hierarchy_radio.lvl0)']
@@ -0,0 +1,184 @@
+# coding: utf-8
+from scrapy.http import HtmlResponse, Request, Response
+
+from ..abstract import get_spider
+from ..default_strategy.abstract import get_strategy
+from ...conditional_request_middleware import ConditionalRequestMiddleware
+from ...validator_cache import ValidatorCache
+
+
+class FakeSpider:
+    js_render = False
+
+
+def get_response(url, body, headers=None, status=200):
+    request = Request(url)
+    return HtmlResponse(url, status=status, headers=headers, body=body,
+                        encoding='utf-8', request=request)
+
+
+def crawl(path, strategy, response, js_render=False):
+    """Index the response as the spider would, return the indexed records"""
+    validator_cache = ValidatorCache(
+        path, config_digest=ValidatorCache.get_config_digest(
+            strategy.config.config_content))
+    spider = get_spider(validator_cache=validator_cache, strategy=strategy,
+                        js_render=js_render)
+
+    spider.add_records(response, False)
+    validator_cache.close()
+
+    return spider.algolia_helper.added, validator_cache.nb_reused
+
+
+class TestValidatorCache:
+    def test_records_are_reused_when_the_body_is_the_same(self, tmpdir):
+        # Given
+        cache = ValidatorCache(str(tmpdir.join('cache.sqlite')))
+        records = [{'objectID': 'a', 'content': u'‽✗✓'}]
+        cache.store(get_response('http://test.com/', b'<p>Foo</p>'), records)
+
+        # When
+        unchanged = cache.get_records(
+            get_response('https://test.com/', b'<p>Foo</p>'))
+        changed = cache.get_records(
+            get_response('http://test.com/', b'<p>Bar</p>'))
+
+        # Then
+        assert unchanged == records
+        assert changed is None
+        assert cache.nb_reused == 1
+
+    def test_cache_survives_close(self, tmpdir):
+        # Given
+        path = str(tmpdir.join('cache.sqlite'))
+        cache = ValidatorCache(path)
+        cache.store(get_response('http://test.com/', b'<p>Foo</p>',
+                                 {'ETag': '"abc"'}), [])
+        cache.close()
+
+        # When
+        actual = ValidatorCache(path).get_validators(
+            Request('http://test.com/'))
+
+        # Then
+        assert actual == ('"abc"', None)
+
+    def test_records_are_extracted_again_when_the_config_changed(self,
+                                                                 tmpdir):
+        # Given
+        path = str(tmpdir.join('cache.sqlite'))
+        response = get_response('http://test.com/', b"""
+        <html><body><h1>Foo</h1><p>Bar</p><ul><li>Baz</li></ul></body></html>
+        """)
+        selectors = {'lvl0': 'h1', 'content': 'p'}
+        crawl(path, get_strategy({'selectors': selectors}), response)
+
+        # When
+        new_selectors = {'lvl0': 'h1', 'content': 'p, li'}
+        changed, changed_reused = crawl(
+            path, get_strategy({'selectors': new_selectors}), response)
+        same, same_reused = crawl(
+            path, get_strategy({'selectors': new_selectors,
+                                'batch_size': 10}), response)
+
+        # Then
+        assert [record['content'] for record in changed] == [None, 'Bar',
+                                                             'Baz']
+        assert changed_reused == 0
+        assert [record['objectID'] for record in same] == [
+            record['objectID'] for record in changed]
+        assert same_reused == 1
+
+    def test_pages_cached_without_config_digest_are_parsed_again(self,
+                                                                  tmpdir):
+        # Given
+        path = str(tmpdir.join('cache.sqlite'))
+        cache = ValidatorCache(path)
+        cache.connection.execute('DROP TABLE pages')
+        cache.connection.execute(
+            'CREATE TABLE pages (fingerprint TEXT PRIMARY KEY, etag TEXT, '
+            'last_modified TEXT, body_digest TEXT NOT NULL, '
+            'body BLOB NOT NULL, encoding TEXT NOT NULL, '
+            'records TEXT NOT NULL)')
+        cache.connection.execute(
+            'INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (cache.get_fingerprint(Request('http://test.com/')), '"abc"',
+             None, cache.get_body_digest(b'<p>Foo</p>'), b'', 'utf-8', '[]'))
+        cache.close()
+
+        # When
+        cache = ValidatorCache(path, config_digest='digest')
+        records = cache.get_records(
+            get_response('http://test.com/', b'<p>Foo</p>'))
+
+        # Then
+        assert records is None
+        assert cache.get_validators(Request('http://test.com/')) == (
+            '"abc"', None)
+
+
+    def test_rendered_pages_are_not_cached(self, tmpdir):
+        # Given
+        path = str(tmpdir.join('cache.sqlite'))
+        response = get_response('http://test.com/', b"""
+        <html><body><h1>Foo</h1><p>Bar</p></body></html>
+        """, {'ETag': '"abc"'})
+        strategy = get_strategy()
+
+        # When
+        crawl(path, strategy, response, js_render=True)
+        records, reused = crawl(path, strategy, response, js_render=True)
+
+        # Then
+        assert [record['content'] for record in records] == [None, 'Bar']
+        assert reused == 0
+        assert ValidatorCache(path).get_validators(
+            Request('http://test.com/')) is None
+
+class TestConditionalRequestMiddleware:
+    def get_middleware(self, tmpdir):
+        cache = ValidatorCache(str(tmpdir.join('cache.sqlite')))
+        cache.store(get_response('http://test.com/', b'<p>Foo</p>', {
+            'ETag': '"abc"',
+            'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'
+        }), [{'objectID': 'a'}])
+
+        middleware = ConditionalRequestMiddleware()
+        middleware.validator_cache = cache
+
+        return middleware
+
+    def test_validators_are_sent(self, tmpdir):
+        # Given
+        middleware = self.get_middleware(tmpdir)
+        request = Request('http://test.com/')
+        unknown_request = Request('http://test.com/other')
+
+        # When
+        middleware.process_request(request, FakeSpider())
+        middleware.process_request(unknown_request, FakeSpider())
+
+        # Then
+        assert request.headers.get('If-None-Match') == b'"abc"'
+        assert request.headers.get(
+            'If-Modified-Since') == b'Wed, 21 Oct 2015 07:28:00 GMT'
+        assert unknown_request.headers.get('If-None-Match') is None
+
+    def test_not_modified_is_answered_from_the_cache(self, tmpdir):
+        # Given
+        middleware = self.get_middleware(tmpdir)
+        request = Request('http://test.com/')
+        not_modified = Response('http://test.com/', status=304,
+                                request=request)
+
+        # When
+        actual = middleware.process_response(request, not_modified,
+                                              FakeSpider())
+
+        # Then
+        assert actual.status == 200
+        assert actual.body == b'<p>Foo</p>'
+        assert 'cached' in actual.flags
+        assert middleware.validator_cache.get_records(actual) == [
+            {'objectID': 'a'}]
@@ -0,0 +1,54 @@
+# coding: utf-8
+from ...config.config_loader import ConfigLoader
+from .abstract import config
+import pytest
+
+
+class TestBatchSettings:
+    def test_batch_settings_default(self):
+        """ Should send batches of 1000 records at least every 5 seconds """
+        # Given
+        c = config()
+
+        # When
+        actual = ConfigLoader(c)
+
+        # Then
+        assert actual.batch_size == 1000
+        assert actual.batch_flush_interval == 5
+
+    def test_flush_interval_can_be_disabled(self):
+        """ Batches are only sent once full with a batch_flush_interval of 0 """
+        # Given
+        c = config({
+            'batch_flush_interval': 0
+        })
+
+        # When
+        actual = ConfigLoader(c)
+
+        # Then
+        assert actual.batch_flush_interval == 0
+
+    def test_negative_flush_interval_is_rejected(self):
+        """ Should throw if batch_flush_interval is negative """
+        # Given
+        c = config({
+            'batch_flush_interval': -1
+        })
+
+        # When / Then
+        with pytest.raises(Exception, match='batch_flush_interval'):
+            ConfigLoader(c)
+
+    def test_batch_size_below_one_is_rejected(self):
+        """ Should throw if batch_size is not a positive integer """
+        for batch_size in [0, -10, 1.5]:
+            # Given
+            c = config({
+                'batch_size': batch_size
+            })
+
+            # When / Then
+            with pytest.raises(Exception, match='batch_size'):
+                ConfigLoader(c)
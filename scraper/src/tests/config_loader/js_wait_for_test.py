@@ -0,0 +1,47 @@
+# coding: utf-8
+from ...config.config_loader import ConfigLoader
+from .abstract import config
+import pytest
+
+
+class TestJsWaitFor:
+    def test_js_wait_for_conditions(self):
+        """ Should accept every condition with a value of its type """
+        for js_wait_for in [{'selector': '.content'}, {'network_idle': 500},
+                            {'script': 'return window.ready === true;'}]:
+            # Given
+            c = config({
+                'js_wait_for': js_wait_for
+            })
+
+            # When
+            actual = ConfigLoader(c)
+
+            # Then
+            assert actual.page_ready.condition == js_wait_for
+
+    def test_unknown_condition_is_rejected(self):
+        """ Should throw on a typo in the condition """
+        # Given
+        c = config({
+            'js_wait_for': {'selectr': '.content'}
+        })
+
+        # When / Then
+        with pytest.raises(Exception, match='js_wait_for should have one key'):
+            ConfigLoader(c)
+
+    def test_wrong_value_types_are_rejected(self):
+        """ Should throw when the value doesn't match the condition """
+        for js_wait_for in [{'selector': ['.content']}, {'script': ''},
+                            {'network_idle': '500'}, {'network_idle': 0},
+                            {'network_idle': True}]:
+            # Given
+            c = config({
+                'js_wait_for': js_wait_for
+            })
+
+            # When / Then
+            with pytest.raises(Exception, match='js_wait_for ' + list(
+                    js_wait_for)[0] + ' should be'):
+                ConfigLoader(c)
@@ -0,0 +1,93 @@
+# coding: utf-8
+import sys
+import threading
+
+from ...lru_cache import LruCache
+
+
+class InterleavingKey:
+    """Key letting another thread evict it in the middle of a get"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.nb_hashes = None
+        self.thread = None
+
+    def __hash__(self):
+        if self.nb_hashes is not None:
+            self.nb_hashes += 1
+            # Found by the first lookup of get, before the second one
+            if self.nb_hashes == 2:
+                self.thread = threading.Thread(target=self.cache.set,
+                                               args=('other', 2))
+                self.thread.start()
+                self.thread.join(0.2)
+        return 1
+
+
+class TestLruCache:
+    def test_least_recently_used_is_evicted(self):
+        # Given
+        cache = LruCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        # When
+        cache.get('a')
+        cache.set('c', 3)
+
+        # Then
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+        assert (cache.hits, cache.misses) == (3, 1)
+
+    def test_cache_is_shared_by_threads(self):
+        # Given
+        cache = LruCache(8)
+        errors = []
+
+        def use_cache(offset):
+            try:
+                for i in range(20000):
+                    key = (i + offset) % 16
+                    if cache.get(key) is None:
+                        cache.set(key, key)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=use_cache, args=(offset,)) for
+                   offset in range(8)]
+
+        # When
+        # Threads are switched as often as possible to interleave the calls
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        # Then
+        assert errors == []
+        assert len(cache) == 8
+        assert cache.hits + cache.misses == 8 * 20000
+
+    def test_key_is_not_evicted_during_a_get(self):
+        # Given
+        cache = LruCache(1)
+        key = InterleavingKey(cache)
+        cache.set(key, 1)
+        key.nb_hashes = 0
+
+        # When
+        actual = cache.get(key)
+        key.thread.join()
+
+        # Then
+        assert actual == 1
+        assert cache.get('other') == 2
+        assert cache.get(key) is None
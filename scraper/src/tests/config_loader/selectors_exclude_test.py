@@ -1,6 +1,9 @@
 # coding: utf-8
+from lxml.cssselect import CSSSelector
+
 from ...config.config_loader import ConfigLoader
 from .abstract import config
+import pytest
 
 
 class TestSelectorsExclude:
@@ -46,3 +49,36 @@ class TestSelectorsExclude:
 
         # Then
         assert actual.selectors_exclude == []
+
+    def test_selectors_exclude_xpath_is_a_union(self):
+        """ selectors_exclude are compiled into a single XPath """
+        # Given
+        c = config({
+            'selectors_exclude': ['.foo', 'nav']
+        })
+
+        # When
+        actual = ConfigLoader(c)
+
+        # Then
+        assert actual.selectors_exclude_xpath == ' | '.join(
+            [CSSSelector('.foo').path, CSSSelector('nav').path])
+
+    def test_selectors_exclude_mode_default(self):
+        """ Excluded elements are removed from the DOM by default """
+        # When
+        actual = ConfigLoader(config())
+
+        # Then
+        assert actual.selectors_exclude_mode == 'remove'
+
+    def test_selectors_exclude_mode_should_be_valid(self):
+        """ Should raise if selectors_exclude_mode is unknown """
+        # Given
+        c = config({
+            'selectors_exclude_mode': 'ignore'
+        })
+
+        # When / Then
+        with pytest.raises(Exception):
+            ConfigLoader(c)
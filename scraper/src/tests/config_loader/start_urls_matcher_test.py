@@ -0,0 +1,153 @@
+# coding: utf-8
+import random
+import re
+
+from ...config.config_loader import ConfigLoader
+from ...config.start_urls_matcher import StartUrlsMatcher, WILDCARD
+from ...config.urls_parser import UrlsParser
+from ..abstract import get_spider
+from .abstract import config
+
+
+def get_start_urls():
+    start_urls = []
+    for version in ['1.0', '1.1', '2.0', 'current']:
+        for content in ['book', 'api', 'cookbook']:
+            start_urls.append({
+                'url': 'https://test.com/doc/{}/{}/'.format(version, content),
+                'tags': [version, content],
+                'page_rank': len(start_urls),
+                'selectors_key': content,
+                'url_attributes': {'version': version,
+                                   'type_of_content': content},
+            })
+    start_urls += [
+        {'url': 'https://test.com/doc/', 'extra_attributes': {'a': 1}},
+        {'url': '^https://test.com/blog/(\\d+)/', 'page_rank': 5},
+        {'url': '.*/api/', 'extra_attributes': {'b': 2},
+         'selectors_key': 'any_api'},
+        {'url': '(?i)https://TEST.com/Guide/', 'tags': ['guide']},
+        {'url': '(https?)://other.com/\\1', 'tags': ['backref']},
+        {'url': 'cookbook|recipes', 'selectors_key': 'cooking'},
+        {'url': 'https://test.com/', 'tags': ['fallback']},
+    ]
+
+    for start_url in start_urls:
+        start_url.setdefault('tags', [])
+        start_url.setdefault('page_rank', 0)
+        start_url.setdefault('selectors_key', 'default')
+        start_url.setdefault('url_attributes', {})
+        start_url['compiled_url'] = re.compile(start_url['url'])
+
+    return start_urls
+
+
+def get_urls(generator, nb_urls):
+    paths = ['doc/', '1.0/', '1.1/', '2.0/', 'current/', 'book/', 'api/',
+             'cookbook/', 'blog/', '42/', 'guide/', 'Guide/', 'https', 'recipes',
+             'x.html']
+    urls = ['https://test.com/doc/{}/{}/intro.html'.format(version, content)
+            for version in ['1.0', '2.0', 'current', '3.0'] for content in
+            ['book', 'api', 'guide']]
+    for _ in range(0, nb_urls):
+        urls.append(generator.choice(['https://', 'http://', '']) +
+                    generator.choice(['test.com/', 'TEST.com/', 'other.com/']) +
+                    ''.join([generator.choice(paths) for _ in
+                             range(generator.randint(0, 4))]))
+
+    return urls
+
+
+def get_selectors_key(url, start_urls):
+    """Linear lookup of AbstractStrategy.get_selectors_set_key"""
+    for start_url in start_urls:
+        if re.search(start_url['compiled_url'], url) is not None:
+            return start_url['selectors_key']
+    return 'default'
+
+
+class TestStartUrlsMatcher:
+    def test_same_results_as_urls_parser(self):
+        # Given
+        start_urls = get_start_urls()
+        matcher = StartUrlsMatcher(start_urls)
+        urls = get_urls(random.Random(42), 2000)
+
+        # When / Then
+        for url in urls:
+            assert matcher.get_tags(url) == UrlsParser.get_tags(url,
+                                                                start_urls)
+            assert matcher.get_page_rank(url) == UrlsParser.get_page_rank(
+                url, start_urls)
+            assert matcher.get_extra_attributes(
+                url) == UrlsParser.get_extra_attributes(url, start_urls)
+            assert list(matcher.get_url_variables(url)) == list(
+                UrlsParser.get_url_variables(url, start_urls))
+            assert matcher.get_selectors_key(url) == get_selectors_key(
+                url, start_urls)
+
+    def test_literal_prefix(self):
+        # When
+        actual = [StartUrlsMatcher.get_literal_prefix(re.compile(url)) for url
+                  in ['^https://a.b/c?', 'http://a\\.b/(?P<v>.*?)/', '.*/api/',
+                      '(?i)https://a.b/']]
+
+        # Then
+        assert actual == [
+            (list('https://a') + [WILDCARD] + list('b/'), True),
+            (list('http://a.b/'), False),
+            ([], False),
+            ([], False),
+        ]
+
+    def test_built_by_the_config(self):
+        # Given
+        c = config({
+            'start_urls': [
+                {'url': 'https://test.com/doc/', 'tags': ['doc']},
+                'https://test.com/'
+            ]
+        })
+
+        # When
+        actual = ConfigLoader(c).start_urls_matcher
+
+        # Then
+        assert actual.get_tags('https://test.com/doc/intro') == ['doc']
+        assert actual.get_tags('https://test.com/blog') == []
+        assert actual.get_tags('https://foo.com/') == []
+
+    def test_lookups_of_a_page_share_the_cache(self):
+        # Given
+        matcher = StartUrlsMatcher(get_start_urls(), cache_size=2)
+        url = 'https://test.com/doc/1.0/book/intro.html'
+
+        # When
+        matcher.get_tags(url)
+        matcher.get_page_rank(url)
+        matcher.get_selectors_key(url)
+        matcher.get_selectors_key(url)
+        for other_url in ['https://test.com/a', 'https://test.com/b']:
+            matcher.get_tags(other_url)
+        matcher.get_tags(url)
+
+        # Then
+        assert len(matcher.cache) == 2
+        assert matcher.cache.get_report() == '2 hits, 5 misses'
+
+    def test_cache_report_is_printed_with_the_statistics(self, capsys):
+        # Given
+        matcher = StartUrlsMatcher(get_start_urls())
+        matcher.get_tags('https://test.com/doc/')
+        matcher.get_tags('https://test.com/doc/')
+        spider = get_spider(start_urls_cache=matcher.cache,
+                            total_files_processed=1, failed_indexing=0,
+                            failed_indexing_404=0, failed_indexing_500=0,
+                            failed_404_urls=[], failed_500_urls=[])
+
+        # When
+        spider.engine_stopped()
+
+        # Then
+        assert 'Start URLs cache:         1 hits, 1 misses' in \
+            capsys.readouterr().out
@@ -0,0 +1,73 @@
+# coding: utf-8
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from scrapy.http import Request
+
+from ...browser_pool import BrowserPool
+from ...custom_downloader_middleware import CustomDownloaderMiddleware
+from ...page_ready import PageReady
+
+
+class FakeSpider:
+    js_render = True
+    js_wait = 0
+    page_ready = PageReady()
+    remove_get_params = False
+
+
+class FakeDriver:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current_url = None
+        self.nb_rendered = 0
+        self.quitted = False
+
+    def get(self, url):
+        # A browser renders a single page at a time
+        assert self.lock.acquire(blocking=False)
+        self.current_url = url
+        time.sleep(0.05)
+
+    def execute_script(self, script):
+        body = '<html><body><h1>{}</h1></body></html>'.format(self.current_url)
+        self.nb_rendered += 1
+        self.lock.release()
+        return body
+
+    def quit(self):
+        self.quitted = True
+
+
+class TestBrowserPool:
+    def test_pages_are_rendered_by_every_browser(self, monkeypatch):
+        # Given
+        drivers = [FakeDriver(), FakeDriver()]
+        monkeypatch.setattr(CustomDownloaderMiddleware, 'browser_pool',
+                            BrowserPool(drivers))
+        middleware = CustomDownloaderMiddleware()
+        urls = ['http://test.com/{}'.format(i) for i in range(8)]
+
+        # When
+        with ThreadPoolExecutor(4) as executor:
+            responses = list(executor.map(
+                lambda url: middleware.render(Request(url), FakeSpider()),
+                urls))
+
+        # Then
+        assert [response.url for response in responses] == urls
+        assert responses[3].css('h1::text').get() == urls[3]
+        assert [driver.nb_rendered for driver in drivers] != [8, 0]
+        assert sum(driver.nb_rendered for driver in drivers) == 8
+
+    def test_close_quits_every_browser(self):
+        # Given
+        drivers = [FakeDriver(), FakeDriver()]
+        browser_pool = BrowserPool(drivers)
+
+        # When
+        browser_pool.close()
+
+        # Then
+        assert [driver.quitted for driver in drivers] == [True, True]
@@ -0,0 +1,82 @@
+# coding: utf-8
+import time
+
+from selenium.common.exceptions import JavascriptException
+
+from ...page_ready import PageReady, SELECTOR_SCRIPT
+
+
+class FakeDriver:
+    """The selector shows up after `ready_after` polls"""
+
+    current_url = 'http://test.com/'
+
+    def __init__(self, ready_after):
+        self.ready_after = ready_after
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append((script, args))
+        return len(self.scripts) > self.ready_after
+
+
+class LoadingAppDriver(FakeDriver):
+    """The script throws until the app is loaded"""
+
+    def execute_script(self, script, *args):
+        if not super(LoadingAppDriver, self).execute_script(script, *args):
+            raise JavascriptException('window.app is undefined')
+        return True
+
+
+class TestPageReady:
+    def test_wait_ends_as_soon_as_the_page_is_ready(self):
+        # Given
+        driver = FakeDriver(ready_after=2)
+        page_ready = PageReady({'selector': '.content'}, timeout=5,
+                               poll_frequency=0.01)
+
+        # When
+        start = time.time()
+        page_ready.wait(driver, 1)
+        elapsed = time.time() - start
+
+        # Then
+        assert elapsed < 1
+        assert driver.scripts[0] == (SELECTOR_SCRIPT, ('.content',))
+        assert len(driver.scripts) == 3
+
+    def test_page_is_read_after_the_timeout(self):
+        # Given
+        driver = FakeDriver(ready_after=1000)
+        page_ready = PageReady({'script': 'return window.ready;'},
+                               timeout=0.1, poll_frequency=0.01)
+
+        # When
+        page_ready.wait(driver, 1)
+
+        # Then
+        assert driver.scripts[-1] == ('return window.ready;', ())
+
+    def test_script_errors_are_polled_again(self):
+        # Given
+        driver = LoadingAppDriver(ready_after=2)
+        page_ready = PageReady({'script': 'return window.app.ready;'},
+                               timeout=5, poll_frequency=0.01)
+
+        # When
+        page_ready.wait(driver, 1)
+
+        # Then
+        assert len(driver.scripts) == 3
+
+    def test_sleep_without_condition(self, monkeypatch):
+        # Given
+        sleeps = []
+        monkeypatch.setattr('time.sleep', sleeps.append)
+
+        # When
+        PageReady().wait(FakeDriver(ready_after=0), 2)
+
+        # Then
+        assert sleeps == [2]
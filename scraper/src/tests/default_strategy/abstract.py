@@ -15,7 +15,7 @@ SELECTORS = {
 }
 
 
-def get_strategy(config=None):
+def get_strategy(config=None, strategy_class=DefaultStrategy):
     if config is None:
         config = {}
 
@@ -41,4 +41,4 @@ def get_strategy(config=None):
     for key in config:
         modified_config[key] = config[key]
 
-    return DefaultStrategy(ConfigLoader(json.dumps(modified_config)))
+    return strategy_class(ConfigLoader(json.dumps(modified_config)))
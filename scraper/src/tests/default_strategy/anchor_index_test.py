@@ -0,0 +1,72 @@
+# coding: utf-8
+import random
+
+import lxml.html
+
+from ...strategies.anchor import Anchor
+
+# Documents of get_anchor_test.py
+DOCUMENTS = [
+    '<html><body><h1>Foo</h1><h2 name="bar">Bar</h2><h3>Baz</h3></body></html>',
+    '<div><a id="bar"></a><div><div><h2>Bar</h2></div></div></div>',
+    '<html><body><h1>Foo</h1><h2 id="bar">Bar</h2><h3>Baz</h3></body></html>',
+    '<html><body><h1>Foo</h1><h2><a href="#" name="bar">Bar</a><span></span>'
+    '</h2><h3>Baz</h3></body></html>',
+    '<html><body><h1>Foo</h1><h2>Bar</h2><h3>Baz</h3></body></html>',
+    '<html><body><h1>Foo</h1><h2 id=\'__docusaurus\'>Bar</h2><h3>Baz</h3>'
+    '</body></html>',
+    '<html><body><article id=\'__docusaurus\'><h1>Foo</h1><h2>Bar</h2>'
+    '<h3>Baz</h3></article></body></html>',
+]
+
+
+def get_random_document(generator, nb_elements):
+    html = '<div>'
+    depth = 1
+    for i in range(0, nb_elements):
+        attribute = generator.choice([
+            '', '', '', ' id="id{}"'.format(i), ' name="name{}"'.format(i),
+            ' id="__hidden{}"'.format(i), ' name=""', ' name="" id="both"',
+        ])
+        html += generator.choice(['', '<!-- comment -->', 'text'])
+        if depth > 1 and generator.random() < 0.3:
+            html += '</section>'
+            depth -= 1
+        html += '<section{}>'.format(attribute)
+        depth += 1
+
+    return lxml.html.fromstring(html + '</section>' * (depth - 1) + '</div>')
+
+
+def assert_same_anchors(dom):
+    index = Anchor.get_anchor_index(dom)
+
+    elements = [element for element in dom.getroottree().getroot().iter()
+                if isinstance(element.tag, str)]
+    assert len(index) == len(elements)
+    for element in elements:
+        assert Anchor.get_anchor(element, index) == Anchor.get_anchor(element)
+
+
+class TestAnchorIndex:
+    def test_same_anchors_as_get_anchor_test(self):
+        for document in DOCUMENTS:
+            assert_same_anchors(lxml.html.fromstring(document))
+
+    def test_same_anchors_on_random_documents(self):
+        generator = random.Random(42)
+        for _ in range(0, 50):
+            assert_same_anchors(get_random_document(generator, 60))
+
+    def test_index_covers_the_whole_document(self):
+        # Given
+        dom = lxml.html.fromstring(
+            '<html><body><a name="top"></a><div><h2>Foo</h2></div></body></html>')
+        body = dom.find('body')
+
+        # When
+        index = Anchor.get_anchor_index(body)
+
+        # Then
+        assert index[dom.find('.//h2')] == 'top'
+        assert dom in index
@@ -0,0 +1,84 @@
+# coding: utf-8
+import lxml.html
+from .abstract import get_strategy
+
+
+class TestCompiledXpaths:
+    def test_selectors_are_compiled_at_load_time(self):
+        # Given
+        strategy = get_strategy({
+            'selectors': {
+                'lvl0': {
+                    'selector': 'h1',
+                    'global': True
+                },
+                'lvl1': {
+                    'selector': '.parameters',
+                    'attributes': {
+                        'name': '.name'
+                    }
+                },
+                'content': 'p'
+            }
+        })
+        selectors = strategy.config.selectors['default']
+
+        # Then
+        assert selectors['lvl0']['selector'] in strategy.compiled_xpaths
+        assert selectors['lvl1']['selector'] in strategy.compiled_xpaths
+        assert selectors['lvl1']['attributes']['name'][
+                   'selector'] in strategy.compiled_xpaths
+        assert selectors['content']['selector'] in strategy.compiled_xpaths
+
+    def test_compile_count_stays_constant_during_crawl(self):
+        # Given
+        strategy = get_strategy({
+            'selectors': {
+                'api': {
+                    'lvl0': 'h1',
+                    'lvl1': {
+                        'selector': '.parameters',
+                        'attributes': {
+                            'name': '.name'
+                        }
+                    },
+                    'content': 'p'
+                },
+                'guides': {
+                    'lvl0': {
+                        'selector': 'h1',
+                        'global': True
+                    },
+                    'lvl1': 'h2'
+                }
+            },
+            'start_urls': [
+                {
+                    'url': 'http://test.com/docs/guides',
+                    'selectors_key': 'guides'
+                },
+                {
+                    'url': 'http://test.com/docs/api',
+                    'selectors_key': 'api'
+                }
+            ]
+        })
+        nb_compiled_xpaths = len(strategy.compiled_xpaths)
+
+        # When
+        for i in range(0, 10):
+            strategy.dom = lxml.html.fromstring("""
+            <html><body>
+                <h1>Foo {}</h1>
+                <h2>Bar</h2>
+                <div class='parameters'><div class="name">Baz</div></div>
+                <p>text</p>
+            </body></html>
+            """.format(i))
+            strategy.get_records_from_dom(
+                'http://test.com/docs/api/{}'.format(i))
+            strategy.get_records_from_dom(
+                'http://test.com/docs/guides/{}'.format(i))
+
+        # Then
+        assert len(strategy.compiled_xpaths) == nb_compiled_xpaths
@@ -0,0 +1,57 @@
+# coding: utf-8
+import html
+
+from .abstract import get_strategy
+from ...strategies.abstract_strategy import AbstractStrategy
+
+
+def reference_escape(text, keep_tags):
+    """Escaping with one replace pass per kept tag, as it used to be done"""
+    text = html.escape(text)
+
+    for tag in keep_tags:
+        opening_tag = "<" + tag + ">"
+        closing_tag = "</" + tag + ">"
+        text = text.replace(html.escape(opening_tag), opening_tag)
+        text = text.replace(html.escape(closing_tag), closing_tag)
+
+    text = text.replace('&amp;', '&')
+
+    return text
+
+
+class TestEscape:
+    def test_same_escaping_as_replace_passes(self):
+        # Given
+        keep_tags = ['code', 'b', 'em']
+        get_strategy({'keep_tags': keep_tags})
+        texts = [
+            'Foo',
+            '<code>a < b && c > d</code>',
+            '<<code>>',
+            '</b></em><b><em>',
+            '"quoted" \'single\'',
+            '&lt;code&gt; &amp;amp; &',
+            '<code class="x">not kept</code>',
+            '<span>not kept</span><emphasis>',
+            u'UTF8 ‽✗✓ <b>Madness</b>',
+        ]
+
+        # When
+        actual = [AbstractStrategy.escape(text) for text in texts]
+
+        # Then
+        assert actual == [reference_escape(text, keep_tags) for text in
+                          texts]
+
+    def test_escaping_twice_changes_nothing(self):
+        # Given
+        get_strategy({'keep_tags': ['code']})
+        text = AbstractStrategy.escape('<code>a < "b" & c</code>')
+
+        # When
+        actual = AbstractStrategy.escape(text)
+
+        # Then
+        assert actual == '<code>a &lt; &quot;b&quot; & c</code>'
+        assert actual == text
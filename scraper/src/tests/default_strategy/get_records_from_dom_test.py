@@ -1,13 +1,19 @@
 # coding: utf-8
 from .abstract import get_strategy
 import lxml.html
+import pytest
 from scrapy.http import TextResponse
 
+from ...strategies.default_strategy import DefaultStrategy
+from ...strategies.single_pass_strategy import SinglePassStrategy
 
+
+@pytest.mark.parametrize('strategy_class', [DefaultStrategy,
+                                            SinglePassStrategy])
 class TestGetRecordsFromDom:
-    def test_simple(self):
+    def test_simple(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
         strategy.dom = lxml.html.fromstring("""
         <html><body>
           <h1>Foo</h1>
@@ -33,9 +39,9 @@ class TestGetRecordsFromDom:
         assert actual[2]['hierarchy']['lvl1'] == 'Bar'
         assert actual[2]['hierarchy']['lvl2'] == 'Baz'
 
-    def test_text(self):
+    def test_text(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
         strategy.dom = lxml.html.fromstring("""
         <html><body>
             <p>text</p>
@@ -55,9 +61,9 @@ class TestGetRecordsFromDom:
         assert actual[0]['hierarchy']['lvl1'] is None
         assert actual[0]['hierarchy']['lvl2'] is None
 
-    def test_text_with_utf8(self):
+    def test_text_with_utf8(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
         strategy.dom = lxml.html.fromstring(u"""
         <html><body>
             <p>UTF8 ‽✗✓ Madness</p>
@@ -71,9 +77,9 @@ class TestGetRecordsFromDom:
         assert actual[0]['type'] == 'content'
         assert actual[0]['content'] == u"UTF8 ‽✗✓ Madness"
 
-    def test_different_wrappers(self):
+    def test_different_wrappers(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
         strategy.dom = lxml.html.fromstring("""
         <html><body>
             <header>
@@ -114,9 +120,9 @@ class TestGetRecordsFromDom:
         assert actual[5]['hierarchy']['lvl1'] == 'Bar'
         assert actual[5]['hierarchy']['lvl2'] == 'Baz'
 
-    def test_selector_contains_elements(self):
+    def test_selector_contains_elements(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
         strategy.dom = lxml.html.fromstring("""
         <html><body>
             <h1><a href="#">Foo</a><span></span></h1>
@@ -131,9 +137,9 @@ class TestGetRecordsFromDom:
         assert actual[0]['hierarchy']['lvl1'] is None
         assert actual[0]['hierarchy']['lvl2'] is None
 
-    def test_text_with_only_three_levels(self):
+    def test_text_with_only_three_levels(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -154,11 +160,11 @@ class TestGetRecordsFromDom:
         assert actual[0]['hierarchy']['lvl1'] is None
         assert actual[0]['hierarchy']['lvl2'] is None
 
-    def test_backward_compatibility_selectors(self):
+    def test_backward_compatibility_selectors(self, strategy_class):
         # Given
         strategy = get_strategy({
             'strip_chars': ',.'
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -180,7 +186,7 @@ class TestGetRecordsFromDom:
         assert actual[3]['hierarchy']['lvl2'] == 'Baz'
         assert actual[3]['content'] == 'text'
 
-    def test_xpath_text_feature(self):
+    def test_xpath_text_feature(self, strategy_class):
         # Given
         strategy = get_strategy({
             'selectors': {
@@ -193,7 +199,7 @@ class TestGetRecordsFromDom:
                 }
             },
             'strip_chars': ',.'
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -217,7 +223,7 @@ class TestGetRecordsFromDom:
         assert actual[3]['hierarchy']['lvl2'] == 'Baz'
         assert actual[3]['content'] == 'text'
 
-    def test_multiple_selectors_set(self):
+    def test_multiple_selectors_set(self, strategy_class):
         # Given
         strategy = get_strategy({
             'selectors': {
@@ -241,7 +247,7 @@ class TestGetRecordsFromDom:
                     'selectors_key': 'api'
                 }
             ]
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -264,7 +270,7 @@ class TestGetRecordsFromDom:
         assert actual[3]['hierarchy']['lvl2'] == 'Baz!'
         assert actual[3]['content'] == 'text'
 
-    def test_multiple_selectors_set_2(self):
+    def test_multiple_selectors_set_2(self, strategy_class):
         # Given
         strategy = get_strategy({
             'selectors': {
@@ -288,7 +294,7 @@ class TestGetRecordsFromDom:
                     'selectors_key': 'api'
                 }
             ]
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -308,7 +314,7 @@ class TestGetRecordsFromDom:
         assert actual[0]['type'] == 'lvl0'
         assert actual[0]['hierarchy']['lvl0'] == 'Foo'
 
-    def test_keep_tags(self):
+    def test_keep_tags(self, strategy_class):
         # Given
         strategy = get_strategy({
             'selectors': {
@@ -335,7 +341,7 @@ class TestGetRecordsFromDom:
                     'selectors_key': 'api'
                 }
             ]
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -355,14 +361,14 @@ class TestGetRecordsFromDom:
         assert actual[0]['type'] == 'lvl0'
         assert actual[0]['hierarchy']['lvl0'] == '<code>Foo</code>'
 
-    def test_stop_content(self):
+    def test_stop_content(self, strategy_class):
         # Given
         strategy = get_strategy({
             'start_urls': [
                 'http://test.com/docs/guides'
             ],
             'stop_content': '404'
-        })
+        }, strategy_class)
 
         html = """
         <html><body>
@@ -381,14 +387,14 @@ class TestGetRecordsFromDom:
         # Then
         assert len(actual) == 0
 
-    def test_selectors_exclude_tail(self):
+    def test_selectors_exclude_tail(self, strategy_class):
         # Given
         strategy = get_strategy({
             'selectors_exclude': ['.test'],
             'start_urls': [
                 'http://test.com/docs/guides'
             ],
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -408,14 +414,14 @@ class TestGetRecordsFromDom:
         assert actual[1]['type'] == 'lvl1'
         assert actual[1]['hierarchy']['lvl1'] == 'Bar'
 
-    def test_selectors_exclude_tail2(self):
+    def test_selectors_exclude_tail2(self, strategy_class):
         # Given
         strategy = get_strategy({
             'selectors_exclude': ['.test'],
             'start_urls': [
                 'http://test.com/docs/guides'
             ],
-        })
+        }, strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
         <html><body>
@@ -435,9 +441,9 @@ class TestGetRecordsFromDom:
         assert actual[1]['type'] == 'lvl1'
         assert actual[1]['hierarchy']['lvl1'] == 'Bar'
 
-    def test_objectID(self):
+    def test_objectID(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
         strategy.dom = lxml.html.fromstring("""
         <html><body>
           <h1>Foo</h1>
@@ -462,13 +468,13 @@ class TestGetRecordsFromDom:
         assert actual[2][
             'objectID'] == '71980d31d18995da99751933a79075e35b1a68bc'
 
-    def test_current_level(self):
+    def test_current_level(self, strategy_class):
         # Given
         strategy = get_strategy({
             'start_urls': [
                 'http://test.com/docs/guides'
             ]
-        })
+        }, strategy_class)
 
         html = """
             <html><body>
@@ -487,9 +493,9 @@ class TestGetRecordsFromDom:
         # Then
         assert len(actual) == 3
 
-    def test_text_with_empty_content(self):
+    def test_text_with_empty_content(self, strategy_class):
         # Given
-        strategy = get_strategy()
+        strategy = get_strategy(strategy_class=strategy_class)
 
         strategy.dom = lxml.html.fromstring("""
             <html><body>
@@ -0,0 +1,100 @@
+# coding: utf-8
+import inspect
+import sys
+
+import lxml.html
+import pytest
+
+from .abstract import get_strategy
+from ...strategies.abstract_strategy import AbstractStrategy
+
+
+def reference_itertext(node):
+    """Recursive implementation the text extraction used to rely on"""
+    tag = node.tag
+    if not isinstance(tag, str) and tag is not None:
+        return
+
+    if node.text:
+        if node.tag not in AbstractStrategy.keep_tags:
+            yield node.text
+        else:
+            yield '<' + node.tag + '>' + node.text + '</' + node.tag + '>'
+    for e in node:
+        for s in reference_itertext(e):
+            yield s
+        if e.tail:
+            yield e.tail
+
+
+def reference_get_text(element):
+    text = ""
+    for s in reference_itertext(element):
+        text = text + " " + s
+
+    text = text.strip()
+    if len(text) == 0:
+        return None
+
+    return AbstractStrategy.escape(text)
+
+
+def get_nested_lists(depth, nb_items):
+    html = ''
+    for i in range(0, depth):
+        items = ''.join(
+            ['<li>Item {} of list {}</li>'.format(j, i) for j in
+             range(0, nb_items)])
+        html = '<ul><li>List {} <code>code</code>{}</li>{}</ul>'.format(
+            i, html, items)
+
+    return lxml.html.fromstring('<div>' + html + '</div>')
+
+
+def get_text_with_stack_limit(get_text, element, nb_frames):
+    """Call get_text with at most nb_frames more frames on the stack"""
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + nb_frames)
+    try:
+        return get_text(element)
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+class TestGetText:
+    def test_same_text_as_the_recursive_implementation(self):
+        # Given
+        get_strategy({'keep_tags': ['code']})
+        dom = lxml.html.fromstring("""
+        <div>
+            Intro <!-- a comment --> after comment
+            <p>A <code>keep<b>bold</b> tail</code> paragraph &amp; more</p>
+            <?pi ignored?>pi tail
+            <ul><li>One<ul><li>Two<ul><li>Three</li></ul></li></ul></li></ul>
+            <p></p><p>   </p>
+            <code></code>last
+        </div>
+        """)
+
+        # When
+        actual = [AbstractStrategy.get_text(node) for node in dom.iter()]
+
+        # Then
+        assert actual == [reference_get_text(node) for node in dom.iter()]
+        assert list(AbstractStrategy.itertext(dom)) == list(
+            reference_itertext(dom))
+
+    def test_deeply_nested_lists(self):
+        # Given
+        get_strategy({'keep_tags': ['code']})
+        # The HTML parser stops nesting at 255 levels
+        dom = get_nested_lists(120, 50)
+
+        # When
+        actual = get_text_with_stack_limit(AbstractStrategy.get_text, dom, 60)
+
+        # Then
+        assert actual == reference_get_text(dom)
+        # Every fragment went through one generator per ancestor
+        with pytest.raises(RecursionError):
+            get_text_with_stack_limit(reference_get_text, dom, 60)
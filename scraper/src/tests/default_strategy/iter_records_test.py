@@ -0,0 +1,88 @@
+# coding: utf-8
+from scrapy.http import HtmlResponse
+
+from .abstract import get_strategy
+
+
+def get_response():
+    body = """
+    <html><body>
+        <h1>Foo</h1>
+        <h2>Bar</h2>
+        <p>text</p>
+        <p>other text</p>
+    </body></html>
+    """.encode('utf-8')
+    return HtmlResponse('http://test.com/docs', body=body, encoding='utf-8')
+
+
+class TestIterRecordsFromResponse:
+    def test_same_records_as_get_records_from_response(self):
+        # Given
+        strategy = get_strategy()
+
+        # When
+        actual = list(strategy.iter_records_from_response(get_response()))
+
+        # Then
+        assert len(actual) == 4
+        assert actual == strategy.get_records_from_response(get_response())
+
+    def test_records_are_extracted_lazily(self):
+        # Given
+        strategy = get_strategy()
+        records = strategy.iter_records_from_response(get_response())
+
+        # When
+        first = next(records)
+
+        # Then
+        assert first['hierarchy']['lvl0'] == 'Foo'
+        assert len(list(records)) == 3
+
+    def test_stop_content(self):
+        # Given
+        strategy = get_strategy({'stop_content': ['Foo']})
+
+        # When
+        actual = list(strategy.iter_records_from_response(get_response()))
+
+        # Then
+        assert actual == []
+
+    def test_pages_are_extracted_independently(self):
+        # Given
+        strategy = get_strategy({
+            'selectors': {
+                'lvl0': {
+                    'selector': '//h1',
+                    'type': 'xpath',
+                    'global': True
+                },
+                'lvl1': 'h2',
+                'content': 'p'
+            }
+        })
+        other_body = u"""
+        <html><body>
+            <h1>Other</h1>
+            <h2>Page</h2>
+            <p>content</p>
+        </body></html>
+        """.encode('utf-8')
+        other_response = HtmlResponse('http://test.com/other', body=other_body,
+                                      encoding='utf-8')
+        expected = [strategy.get_records_from_response(get_response()),
+                    strategy.get_records_from_response(other_response)]
+
+        # When
+        pages = [strategy.iter_records_from_response(get_response()),
+                 strategy.iter_records_from_response(other_response)]
+        actual = [[next(pages[0])], [next(pages[1])]]
+        actual[0] += list(pages[0])
+        actual[1] += list(pages[1])
+
+        # Then
+        assert actual == expected
+        assert actual[1][0]['hierarchy']['lvl0'] == 'Other'
+        assert strategy.dom is None
@@ -0,0 +1,87 @@
+# coding: utf-8
+import lxml.html
+from .abstract import get_strategy
+
+
+class CountingNode:
+    """Node counting the hashes and comparisons made to find its level"""
+    operations = 0
+
+    def __hash__(self):
+        CountingNode.operations += 1
+        return id(self)
+
+    def __eq__(self, other):
+        CountingNode.operations += 1
+        return self is other
+
+
+def count_level_index(strategy, nb_nodes):
+    nodes = [CountingNode() for _ in range(nb_nodes)]
+    # Every node is content, one in ten is also a lvl1, the first a lvl0
+    nodes_per_level = {'lvl0': nodes[:1], 'lvl1': nodes[::10],
+                       'content': nodes}
+    levels = ['lvl0', 'lvl1', 'content']
+
+    CountingNode.operations = 0
+    level_of_node = strategy._get_level_index(nodes_per_level, levels)
+    for node in nodes:
+        assert level_of_node.get(node) is not None
+    return CountingNode.operations
+
+
+class TestLevelIndex:
+    def test_first_level_wins(self):
+        # Given
+        strategy = get_strategy({
+            'selectors': {
+                'lvl0': 'h1',
+                'lvl1': 'h1, h2',
+                'content': 'p'
+            }
+        })
+        strategy.dom = lxml.html.fromstring("""
+        <html><body>
+            <h1>Foo</h1>
+            <h2>Bar</h2>
+            <p>text</p>
+        </body></html>
+        """)
+
+        # When
+        actual = strategy.get_records_from_dom()
+
+        # Then
+        assert len(actual) == 3
+        assert actual[0]['type'] == 'lvl0'
+        assert actual[1]['type'] == 'lvl1'
+        assert actual[2]['type'] == 'content'
+
+    def test_xpath_text_nodes_are_indexed(self):
+        # Given
+        strategy = get_strategy()
+        strategy.dom = lxml.html.fromstring("""
+        <html><body><h1>Foo</h1><p>text</p></body></html>
+        """)
+        nodes_per_level = {'lvl0': strategy.select('//h1/text()'),
+                           'content': strategy.select('//p/text()')}
+
+        # When
+        actual = strategy._get_level_index(nodes_per_level,
+                                           ['lvl0', 'content'])
+
+        # Then
+        assert actual[strategy.select('//h1/text()')[0]] == 'lvl0'
+        assert actual[strategy.select('//p/text()')[0]] == 'content'
+
+    def test_linear_on_large_page(self):
+        # Given
+        strategy = get_strategy()
+
+        # When
+        actual = count_level_index(strategy, 20000)
+
+        # Then
+        # A few hashes per node, a lookup in the lists of every level would
+        # compare each node with all the nodes before it
+        assert actual < 4 * 20000
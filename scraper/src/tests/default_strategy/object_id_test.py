@@ -0,0 +1,116 @@
+# coding: utf-8
+import hashlib
+import json
+import os
+import random
+import time
+
+import pytest
+
+from ...strategies.object_id import ObjectId
+from .abstract import get_strategy
+
+NB_RECORDS = 100000
+
+
+def reference_object_id(hierarchy, url, position):
+    """Previous implementation, the compat mode must give the same IDs"""
+    hierarchy_to_hash = {lvl: x for lvl, x in hierarchy.items() if
+                         x is not None}
+    raw_hash = hashlib.sha1(json.dumps(
+        {'hierarchy_to_hash': hierarchy_to_hash,
+         'url': url,
+         'position': position}, sort_keys=True).encode('utf-8'))
+    return raw_hash.hexdigest()
+
+
+def get_hierarchy(values):
+    return {'lvl{}'.format(index): value for index, value in
+            enumerate(values)}
+
+
+def get_random_records(nb_records):
+    words = [u'Foo', u'Bär', u'"quoted"', u'<tag>', u'back\\slash', u'日本語',
+             u'tab\tnew\nline', u'😀']
+    records = []
+    for position in range(nb_records):
+        values = [None if random.random() < 0.4 else ' '.join(
+            random.sample(words, 3)) for _ in range(7)]
+        records.append((get_hierarchy(values),
+                        'https://www.foo.com/docs/{}.html#{}'.format(
+                            position // 50, position % 7), position % 50))
+
+    return records
+
+
+def time_records(object_id, records):
+    start = time.perf_counter()
+    for hierarchy, url, position in records:
+        object_id(hierarchy, url, position)
+    return time.perf_counter() - start
+
+
+class TestObjectId:
+    def test_compat_ids_are_the_previous_ones(self):
+        # Given
+        records = get_random_records(2000) + [
+            (get_hierarchy([u'Foo', {'b': 1, 'a': u'é'}, 4.5, True, 12, None,
+                            u'']), None, 0),
+            (get_hierarchy([None] * 7), 'http://foo.com/', 3),
+        ]
+
+        # When / Then
+        for hierarchy, url, position in records:
+            assert ObjectId.get(hierarchy, url, position) == \
+                   reference_object_id(hierarchy, url, position)
+
+    def test_fast_ids_are_stable_and_distinct(self):
+        # Given
+        hierarchy = get_hierarchy([u'Foo', u'Bar', None, None, None, None,
+                                   None])
+        shifted = get_hierarchy([u'Foo', None, u'Bar', None, None, None,
+                                 None])
+        empty = get_hierarchy([u'Foo', u'', None, None, None, None, None])
+
+        # When
+        actual = ObjectId.get_fast(hierarchy, 'http://foo.com/', 1)
+
+        # Then
+        assert actual == ObjectId.get_fast(dict(hierarchy), 'http://foo.com/',
+                                           1)
+        assert len(actual) == 40
+        assert len({actual,
+                    ObjectId.get_fast(hierarchy, 'http://foo.com/', 2),
+                    ObjectId.get_fast(hierarchy, 'http://foo.com/a', 1),
+                    ObjectId.get_fast(shifted, 'http://foo.com/', 1),
+                    ObjectId.get_fast(empty, 'http://foo.com/', 1)}) == 5
+
+    def test_strategy_uses_object_id_mode(self):
+        # Given
+        strategy = get_strategy()
+        fast_strategy = get_strategy({'object_id_mode': 'fast'})
+
+        # When
+        actual = strategy.get_object_id(get_hierarchy([u'Foo'] * 7), None, 0)
+        fast = fast_strategy.get_object_id(get_hierarchy([u'Foo'] * 7), None,
+                                           0)
+
+        # Then
+        assert actual == reference_object_id(get_hierarchy([u'Foo'] * 7),
+                                             None, 0)
+        assert fast == ObjectId.get_fast(get_hierarchy([u'Foo'] * 7), None, 0)
+
+    @pytest.mark.skipif('BENCHMARK' not in os.environ,
+                        reason='timings only run with the BENCHMARK env')
+    def test_hashing_is_faster_on_100k_records(self):
+        # Given
+        records = get_random_records(NB_RECORDS)
+
+        # When
+        reference = time_records(reference_object_id, records)
+        compat = time_records(ObjectId.get, records)
+        fast = time_records(ObjectId.get_fast, records)
+
+        # Then
+        assert compat < reference
+        assert fast * 2 < reference
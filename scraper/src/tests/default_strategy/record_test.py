@@ -0,0 +1,144 @@
+# coding: utf-8
+import json
+import pickle
+import tracemalloc
+
+import lxml.html
+
+from ...strategies.record import Record
+from .abstract import get_strategy
+
+HTML = """
+<html><head>
+    <meta name="docsearch:language" content="en">
+</head><body>
+    <h1 id="title">Foo</h1>
+    <p>text</p>
+    <h2>Bar</h2>
+    <p>other text</p>
+</body></html>
+"""
+
+
+def get_record(extra_attributes=None, page_attributes=None):
+    hierarchy = {'lvl0': 'Foo', 'lvl1': 'Bar', 'lvl2': None, 'lvl3': None,
+                 'lvl4': None, 'lvl5': None, 'lvl6': None}
+    radio = {'lvl1': 'Bar', 'lvl0': None}
+    record = Record('title', 'text', hierarchy, radio, 'content', ['tag'], 2,
+                    0, 3, 'http://foo.com/docs/',
+                    {} if extra_attributes is None else extra_attributes,
+                    {} if page_attributes is None else page_attributes)
+    record.url_without_anchor = 'http://foo.com/docs/'
+    record.url = 'http://foo.com/docs/#title'
+    record.url_without_variables = 'http://foo.com/docs/#title'
+    record.no_variables = True
+    record.objectID = 'abc'
+    return record
+
+
+def get_records():
+    strategy = get_strategy()
+    strategy.dom = lxml.html.fromstring(HTML)
+    return strategy.get_records_from_dom('http://foo.com/docs/')
+
+
+class TestRecord:
+    def test_to_dict(self):
+        # Given
+        record = get_record({'version': '1.0'}, {'language': 'en'})
+
+        # When
+        actual = record.to_dict()
+
+        # Then
+        assert list(actual.keys()) == [
+            'anchor', 'content', 'hierarchy', 'hierarchy_radio', 'type',
+            'tags', 'weight', 'url', 'url_without_variables', 'version',
+            'hierarchy_camel', 'hierarchy_radio_camel', 'content_camel',
+            'language', 'url_without_anchor', 'no_variables', 'objectID']
+        assert actual['weight'] == {'page_rank': 2, 'level': 0,
+                                    'position': 3}
+        assert actual['hierarchy_camel'] == (record.hierarchy,)
+        assert actual['hierarchy_radio_camel'] is record.hierarchy_radio
+        assert actual['content_camel'] == 'text'
+        assert actual['url'] == 'http://foo.com/docs/#title'
+
+    def test_attributes_override_the_fields_in_order(self):
+        # Given
+        record = get_record({'content': 'extra'},
+                            {'content': 'meta', 'url': 'ignored'})
+
+        # When
+        actual = record.to_dict()
+
+        # Then
+        assert actual['content'] == 'meta'
+        assert actual['content_camel'] == 'extra'
+        assert actual['url'] == 'http://foo.com/docs/#title'
+
+    def test_mapping_access_is_the_dict_one(self):
+        for record in get_records() + [
+            get_record({'content': 'extra'}, {'content': 'meta'})]:
+            # Given
+            expected = record.to_dict()
+
+            # When
+            actual = {key: record[key] for key in record}
+
+            # Then
+            assert actual == expected
+            assert record == expected
+            assert expected == record
+            assert record.get('missing') is None
+            assert 'objectID' in record
+
+    def test_records_can_be_pickled(self):
+        # Given
+        records = get_records()
+
+        # When
+        actual = pickle.loads(pickle.dumps(records))
+
+        # Then
+        assert actual == records
+        assert isinstance(actual[0], Record)
+
+    def test_as_dict(self):
+        # Given
+        record = get_record()
+
+        # When / Then
+        assert json.dumps(Record.as_dict(record)) == json.dumps(
+            record.to_dict())
+        assert Record.as_dict({'objectID': 'foo'}) == {'objectID': 'foo'}
+
+    def test_records_are_smaller_than_dicts(self):
+        # Given
+        # Shared by the records of a page
+        extra_attributes = {}
+        page_attributes = {'language': 'en', 'version': '1.0'}
+        records = get_records()
+
+        def build(to_dict):
+            built = []
+            for position in range(5000):
+                record = get_record(extra_attributes, page_attributes)
+                record.content = 'text {}'.format(position)
+                built.append(record.to_dict() if to_dict else record)
+            return built
+
+        # When
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        as_records = build(False)
+        records_size = tracemalloc.get_traced_memory()[0] - start
+        del as_records
+        start = tracemalloc.get_traced_memory()[0]
+        as_dicts = build(True)
+        dicts_size = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+
+        # Then
+        assert len(records) == 4
+        assert len(as_dicts) == 5000
+        assert records_size * 3 < dicts_size * 2
@@ -0,0 +1,110 @@
+# coding: utf-8
+import lxml.html
+from lxml.cssselect import CSSSelector
+from scrapy.http import HtmlResponse
+
+from ...strategies.abstract_strategy import AbstractStrategy
+from .abstract import get_strategy
+
+SELECTORS_EXCLUDE = ['.hidden', 'nav', '.note em', 'meta[name="docsearch:version"]']
+
+BODY = """
+<html>
+<head>
+    <meta name="docsearch:language" content="en">
+    <meta name="docsearch:version" content="1.0">
+</head>
+<body>
+    <nav><h1>Menu</h1><a name="nav-anchor">Home</a></nav>
+    <h1 id="title">Foo <span class="hidden">hidden</span>bar</h1>
+    <p>Some <code>code</code><span class="hidden">x</span> after
+        <span class="hidden">y</span>tail</p>
+    <p class="hidden">Hidden paragraph</p>
+    <h2><span class="hidden" id="hidden-anchor">H</span>Bar</h2>
+    <p class="note">A <em>nested <span class="hidden">deeply</span></em> note</p>
+    <div class="hidden"><h2 id="hidden-title">Hidden title</h2><p>skipped</p></div>
+    <p><!-- comment --><span class="hidden">z</span>after comment</p>
+    <h3>Baz</h3>
+    <p>last</p>
+</body>
+</html>
+"""
+
+
+def get_response():
+    return HtmlResponse('http://test.com/docs', body=BODY.encode('utf-8'),
+                        encoding='utf-8')
+
+
+def remove_one_selector_at_a_time(dom, exclude_selectors):
+    """Previous implementation of remove_from_dom"""
+    for selector in exclude_selectors:
+        for match in CSSSelector(selector)(dom):
+            match.drop_tree()
+
+    return dom
+
+
+class TestSelectorsExclude:
+    def test_union_removes_the_same_elements(self):
+        # Given
+        expected = remove_one_selector_at_a_time(lxml.html.fromstring(BODY),
+                                                 SELECTORS_EXCLUDE)
+
+        # When
+        actual = AbstractStrategy.remove_from_dom(lxml.html.fromstring(BODY),
+                                                  SELECTORS_EXCLUDE)
+
+        # Then
+        assert lxml.html.tostring(actual) == lxml.html.tostring(expected)
+
+    def test_excluded_elements_are_removed(self):
+        # Given
+        strategy = get_strategy({'selectors_exclude': SELECTORS_EXCLUDE})
+
+        # When
+        actual = strategy.get_records_from_response(get_response())
+
+        # Then
+        assert [record['hierarchy']['lvl0'] for record in actual][:1] == [
+            'Foo bar']
+        assert 'Hidden paragraph' not in [record['content'] for record in
+                                          actual]
+        assert 'version' not in actual[0]
+
+    def test_skip_mode_extracts_the_same_records(self):
+        # Given
+        remove_strategy = get_strategy({
+            'selectors_exclude': SELECTORS_EXCLUDE,
+            'keep_tags': ['code']
+        })
+        skip_strategy = get_strategy({
+            'selectors_exclude': SELECTORS_EXCLUDE,
+            'selectors_exclude_mode': 'skip',
+            'keep_tags': ['code']
+        })
+
+        # When
+        expected = remove_strategy.get_records_from_response(get_response())
+        actual = skip_strategy.get_records_from_response(get_response())
+
+        # Then
+        assert len(actual) == 7
+        assert actual == expected
+
+    def test_skip_mode_leaves_the_dom_untouched(self):
+        # Given
+        strategy = get_strategy({
+            'selectors_exclude': SELECTORS_EXCLUDE,
+            'selectors_exclude_mode': 'skip'
+        })
+        dom = lxml.html.fromstring(BODY)
+        before = lxml.html.tostring(dom)
+
+        # When
+        excluded = strategy.exclude_from_dom(dom)
+        strategy.get_records_from_dom('http://test.com/docs', dom, excluded)
+
+        # Then
+        assert lxml.html.tostring(dom) == before
+        assert len(excluded) == 15
@@ -0,0 +1,160 @@
+# coding: utf-8
+import json
+
+import lxml.html
+from .abstract import get_strategy
+from ...strategies.single_pass_strategy import SinglePassStrategy
+
+HTML = """
+<html><body>
+    <p>text</p>
+    <header>
+      <h1 id="foo">Foo</h1>
+      <p>text</p>
+    </header>
+    <div>
+      <div>
+        <h2><a href="#" name="bar">Bar</a><span></span></h2>
+        <p>UTF8 ‽✗✓ Madness</p>
+      </div>
+      <div>
+        <p>,text,</p>
+        <div>
+          <h3>Baz</h3>
+          <h3></h3>
+          <p></p>
+        </div>
+      </div>
+    </div>
+</body></html>
+"""
+
+
+def assert_same_records(config, html=HTML, url=None):
+    default_strategy = get_strategy(config)
+    single_pass_strategy = SinglePassStrategy(default_strategy.config)
+
+    default_strategy.dom = lxml.html.fromstring(html)
+    single_pass_strategy.dom = lxml.html.fromstring(html)
+
+    expected = default_strategy.get_records_from_dom(url)
+    actual = single_pass_strategy.iter_records_from_dom(url)
+
+    assert json.dumps([record.to_dict() for record in actual]) == json.dumps(
+        [record.to_dict() for record in expected])
+    assert len(expected) > 0
+
+
+class TestSinglePassStrategy:
+    def test_default_selectors(self):
+        assert_same_records({})
+
+    def test_records_are_generated(self):
+        # Given
+        strategy = SinglePassStrategy(get_strategy().config)
+        strategy.dom = lxml.html.fromstring(HTML)
+
+        # When
+        actual = strategy.iter_records_from_dom()
+
+        # Then
+        assert next(actual)['type'] == 'content'
+        assert next(actual)['hierarchy']['lvl0'] == 'Foo'
+
+    def test_node_matched_by_several_levels(self):
+        assert_same_records({
+            'selectors': {
+                'lvl0': 'h1',
+                'lvl1': 'h1, h2',
+                'lvl2': 'h2, h3',
+                'content': 'p, h3'
+            }
+        })
+
+    def test_xpath_text_feature(self):
+        assert_same_records({
+            'selectors': {
+                "lvl0": "h1",
+                "lvl1": "h2",
+                "lvl2": "h3",
+                "text": {
+                    "selector": "//*[@class=\"content\"]/text()[normalize-space()]",
+                    "type": "xpath"
+                }
+            },
+            'strip_chars': ',.'
+        }, """
+        <html><body>
+            <div class="content">
+                first
+                <h1>Foo</h1>
+                <h2>Bar</h2>
+                between
+                <h3>Baz</h3>
+                text
+            </div>
+        </body></html>
+        """)
+
+    def test_global_selectors(self):
+        assert_same_records({
+            'selectors': {
+                'lvl0': {
+                    'selector': 'h1',
+                    'global': True
+                },
+                'lvl1': 'h2',
+                'lvl2': 'h3',
+                'content': 'p'
+            }
+        })
+
+    def test_custom_attributes(self):
+        assert_same_records({
+            'selectors': {
+                "lvl0": "h1",
+                "lvl1": {
+                    "selector": ".parameters",
+                    "attributes": {
+                        "name": ".name",
+                        "description": ".description"
+                    }
+                },
+                "content": "p"
+            }
+        }, """
+        <html><body>
+            <h1>Foo</h1>
+            <div class='parameters'>
+                <div class="name">Foo</div>
+                <div class="description">Bar</div>
+            </div>
+            <p>Baz</p>
+        </body></html>
+        """)
+
+    def test_multiple_selectors_set(self):
+        assert_same_records({
+            'selectors': {
+                'api': {
+                    "lvl0": "h1",
+                    "lvl1": "h2",
+                    "lvl2": "h3",
+                    "content": "p"
+                },
+                'guides': {
+                    "lvl0": "h1",
+                },
+            },
+            'start_urls': [
+                {
+                    'url': 'http://test.com/docs/guides',
+                    'selectors_key': 'guides'
+                },
+                {
+                    'url': 'http://test.com/docs/api',
+                    'selectors_key': 'api',
+                    'tags': ['api']
+                }
+            ]
+        }, url='http://test.com/docs/api/methods')
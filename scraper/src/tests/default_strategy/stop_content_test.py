@@ -0,0 +1,112 @@
+# coding: utf-8
+from scrapy.http import HtmlResponse
+
+from ...strategies.abstract_strategy import AbstractStrategy
+from ...strategies.stop_content_matcher import StopContentMatcher
+from .abstract import get_strategy
+
+BODY = u"""
+<html><body>
+    <h1>Página no encontrada</h1>
+    <p>text</p>
+</body></html>
+"""
+
+
+def get_response(encoding):
+    return HtmlResponse('http://test.com/docs', body=BODY.encode(encoding),
+                        encoding=encoding)
+
+
+class TestStopContent:
+    def test_raw_bytes_are_searched(self):
+        # Given
+        matcher = StopContentMatcher([u'Not found', u'no encontrada'])
+
+        # When / Then
+        assert matcher.search(BODY.encode('utf-8'), 'utf-8')
+        assert matcher.search(BODY.encode('latin-1'), 'latin-1')
+        assert not StopContentMatcher([u'Not found']).search(
+            BODY.encode('utf-8'), 'utf-8')
+
+    def test_non_ascii_stop_content(self):
+        # Given
+        matcher = StopContentMatcher([u'Página'])
+
+        # When / Then
+        assert matcher.search(BODY.encode('utf-8'), 'utf-8')
+        assert matcher.search(BODY.encode('cp1252'), 'cp1252')
+        assert not matcher.search(u'Pagina'.encode('utf-8'), 'utf-8')
+
+    def test_stop_content_which_can_not_be_encoded(self):
+        # Given
+        matcher = StopContentMatcher([u'ページ', u'text'])
+
+        # When / Then
+        assert matcher.search(BODY.encode('latin-1'), 'latin-1')
+        assert not StopContentMatcher([u'ページ']).search(
+            BODY.encode('latin-1'), 'latin-1')
+
+    def test_multi_byte_encodings_are_not_searched_in_bytes(self):
+        # Given
+        matcher = StopContentMatcher([u'text'])
+
+        # When / Then
+        assert matcher.can_search_bytes('utf-8')
+        assert matcher.can_search_bytes('cp1252')
+        assert not matcher.can_search_bytes('utf-16')
+        assert not matcher.can_search_bytes('shift_jis')
+        assert not matcher.can_search_bytes('iso2022_jp')
+        assert not matcher.can_search_bytes('unknown')
+
+    def test_page_with_stop_content_has_no_records(self):
+        for encoding in ['utf-8', 'latin-1', 'utf-16']:
+            # Given
+            strategy = get_strategy({'stop_content': [u'no encontrada']})
+
+            # When
+            actual = strategy.get_records_from_response(
+                get_response(encoding))
+
+            # Then
+            assert actual == []
+
+    def test_page_without_stop_content_has_records(self):
+        for encoding in ['utf-8', 'latin-1', 'utf-16']:
+            # Given
+            strategy = get_strategy({'stop_content': [u'Not found']})
+
+            # When
+            actual = strategy.get_records_from_response(
+                get_response(encoding))
+
+            # Then
+            assert [record['hierarchy']['lvl0'] for record in actual] == [
+                u'Página no encontrada', u'Página no encontrada']
+
+    def test_body_is_decoded_once(self, monkeypatch):
+        # Given
+        strategy = get_strategy({'stop_content': [u'Not found']})
+        decoded = []
+        get_body = AbstractStrategy.get_body
+        get_dom = AbstractStrategy.get_dom
+
+        def counting_get_body(response):
+            decoded.append(response.url)
+            return get_body(response)
+
+        def checking_get_dom(response, body=None):
+            assert body is not None
+            return get_dom(response, body)
+
+        monkeypatch.setattr(AbstractStrategy, 'get_body',
+                            staticmethod(counting_get_body))
+        monkeypatch.setattr(AbstractStrategy, 'get_dom',
+                            staticmethod(checking_get_dom))
+
+        # When
+        actual = strategy.get_records_from_response(get_response('utf-16'))
+
+        # Then
+        assert len(actual) == 2
+        assert decoded == ['http://test.com/docs']
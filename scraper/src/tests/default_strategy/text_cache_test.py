@@ -0,0 +1,64 @@
+# coding: utf-8
+import lxml.html
+
+from .abstract import get_strategy
+from ...strategies.abstract_strategy import AbstractStrategy
+
+
+class TestTextCache:
+    def test_text_of_each_node_is_computed_once(self, monkeypatch):
+        # Given
+        strategy = get_strategy({
+            'selectors': {
+                'lvl0': {
+                    'selector': '//h1',
+                    'type': 'xpath',
+                    'global': True
+                },
+                'lvl1': 'h2',
+                'content': 'p, li'
+            }
+        })
+        strategy.dom = lxml.html.fromstring("""
+        <html><body>
+            <h1>Foo</h1>
+            <h2>Bar</h2>
+            <ul><li><p>text</p></li></ul>
+        </body></html>
+        """)
+        computed = []
+        get_text = AbstractStrategy._get_text
+
+        def counting_get_text(element, strip_chars, excluded=None):
+            computed.append(element)
+            return get_text(element, strip_chars, excluded)
+
+        monkeypatch.setattr(AbstractStrategy, '_get_text',
+                            staticmethod(counting_get_text))
+
+        # When
+        actual = strategy.get_records_from_dom()
+
+        # Then
+        assert [record['content'] for record in actual] == [None, 'text',
+                                                            'text']
+        assert actual[0]['hierarchy']['lvl0'] == 'Foo'
+        assert len(computed) == len(set(computed))
+
+    def test_text_from_nodes_is_the_same_with_a_cache(self):
+        # Given
+        get_strategy()
+        dom = lxml.html.fromstring("""
+        <div><p>,Foo,</p><p> </p><p>Bar & <b>"baz"</b></p></div>
+        """)
+        nodes = dom.xpath('//p')
+        text_cache = {}
+
+        # When
+        actual = [AbstractStrategy.get_text_from_nodes(nodes, ',', text_cache)
+                  for _ in range(2)]
+
+        # Then
+        assert actual == [AbstractStrategy.get_text_from_nodes(nodes, ',')] * 2
+        assert actual[0] == 'Foo Bar &  &quot;baz&quot;'
+        assert len(text_cache) == 3
@@ -0,0 +1,60 @@
+# coding: utf-8
+import pickle
+
+from scrapy.http import HtmlResponse
+
+from ..default_strategy.abstract import get_strategy
+from ...parse_pool import ParsePool, _get_records
+
+
+class TestParsePool:
+    def test_workers_extract_the_same_records(self):
+        # Given
+        strategy = get_strategy({
+            'start_urls': [{
+                'url': 'http://test.com/docs',
+                'tags': ['docs']
+            }]
+        })
+        body = u"""
+        <html><body>
+            <h1>Foo</h1>
+            <h2 id="bar">Bar</h2>
+            <p>UTF8 ‽✗✓ Madness</p>
+        </body></html>
+        """.encode('utf-8')
+        response = HtmlResponse('http://test.com/docs/guide', body=body,
+                                encoding='utf-8')
+        parse_pool = ParsePool(strategy, 1)
+
+        # When
+        try:
+            actual = parse_pool.pool.apply(
+                _get_records, (response.url, response.body, response.encoding))
+        finally:
+            parse_pool.close()
+
+        # Then
+        assert len(actual) == 3
+        assert actual == strategy.get_records_from_response(response)
+
+    def test_worker_config_can_be_pickled(self):
+        # Given
+        strategy = get_strategy({
+            'start_urls': [{
+                'url': 'http://test.com/docs',
+                'tags': ['docs']
+            }]
+        })
+        strategy.config.start_urls_matcher.match('http://test.com/docs/a')
+
+        # When
+        config = pickle.loads(pickle.dumps(
+            ParsePool.get_worker_config(strategy)))
+
+        # Then
+        assert config.driver is None
+        assert config.start_urls_matcher.match(
+            'http://test.com/docs/a') is not None
+        config.start_urls_matcher.cache.set('key', 'value')
+        assert config.start_urls_matcher.cache.get('key') == 'value'
@@ -0,0 +1,84 @@
+# coding: utf-8
+from queue import Queue
+from types import SimpleNamespace
+
+import pytest
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import HtmlResponse
+
+from ..abstract import AlgoliaHelperMock, get_spider
+from ..default_strategy.abstract import get_strategy
+from ...documentation_spider import DocumentationSpider
+from ...parse_pool import ParsePool
+
+
+class TestSpiderWithParsePool:
+    def test_records_are_indexed_from_the_reactor(self, monkeypatch):
+        # Given
+        # Calls made from the pool threads, run by the test as the reactor
+        reactor_calls = Queue()
+        monkeypatch.setattr(ParsePool, '_call_from_reactor', staticmethod(
+            lambda function, *args: reactor_calls.put((function, args))))
+
+        strategy = get_strategy()
+        body = b'<html><body><h1>Foo</h1><p>Bar</p></body></html>'
+        response = HtmlResponse('http://test.com/docs', body=body,
+                                encoding='utf-8')
+        algolia_helper = AlgoliaHelperMock()
+        parse_pool = ParsePool(strategy, 1)
+        spider = get_spider(parse_pool=parse_pool,
+                            algolia_helper=algolia_helper)
+        DocumentationSpider.NB_INDEXED = 0
+
+        try:
+            # When
+            spider.add_records(response, False)
+
+            # Then
+            assert algolia_helper.added == []
+            with pytest.raises(DontCloseSpider):
+                spider.spider_idle()
+
+            # When
+            function, args = reactor_calls.get(timeout=30)
+            function(*args)
+
+            # Then
+            spider.spider_idle()
+        finally:
+            parse_pool.close()
+
+        assert algolia_helper.added == strategy.get_records_from_response(
+            response)
+        assert algolia_helper.urls == ['http://test.com/docs']
+        assert DocumentationSpider.NB_INDEXED == 2
+        assert spider.successfully_indexed == 1
+
+    def test_spider_stops_waiting_after_a_parsing_error(self, monkeypatch):
+        # Given
+        reactor_calls = Queue()
+        monkeypatch.setattr(ParsePool, '_call_from_reactor', staticmethod(
+            lambda function, *args: reactor_calls.put((function, args))))
+
+        parse_pool = ParsePool(get_strategy(), 1)
+        algolia_helper = AlgoliaHelperMock()
+        spider = get_spider(parse_pool=parse_pool,
+                            algolia_helper=algolia_helper)
+        # The worker can't build a response with an unknown encoding
+        response = SimpleNamespace(url='http://test.com/docs', status=200,
+                                   body=b'<p>Foo</p>',
+                                   encoding='unknown-encoding')
+
+        try:
+            # When
+            spider.add_records(response, False)
+            function, args = reactor_calls.get(timeout=30)
+            function(*args)
+
+            # Then
+            spider.spider_idle()
+        finally:
+            parse_pool.close()
+
+        assert function == parse_pool._on_error
+        assert algolia_helper.added == []
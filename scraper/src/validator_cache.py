@@ -0,0 +1,141 @@
+"""ValidatorCache
+Remember the ETag, Last-Modified and body digest of every crawled page along
+with the records extracted from it, so unchanged pages are neither
+downloaded nor parsed again"""
+
+import hashlib
+import json
+import sqlite3
+import zlib
+
+from scrapy.http import HtmlResponse
+
+from .custom_dupefilter import CustomDupeFilter
+from .strategies.record import Record
+
+# Commit the cache every N pages, a crashed crawl keeps most of its work
+COMMIT_EVERY = 100
+
+# Settings that don't change the records extracted from a page, every other
+# one does
+NON_EXTRACTION_SETTINGS = ['nb_hits', 'nb_hits_max', 'batch_size',
+                           'batch_max_bytes', 'batch_flush_interval',
+                           'batch_concurrency', 'batch_gzip', 'parse_workers',
+                           'browser_pool_size', 'http_cache_path',
+                           'record_hashes_path', 'output_path',
+                           'output_max_bytes', 'output_gzip']
+
+
+class ValidatorCache:
+    """
+    The records of a page are only reused when both its body and the
+    extraction settings of the config (config_digest) are the same as when
+    they were stored.
+    """
+
+    def __init__(self, path, use_anchors=False, config_digest=None):
+        self.use_anchors = use_anchors
+        self.config_digest = config_digest
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS pages ('
+            'fingerprint TEXT PRIMARY KEY, '
+            'etag TEXT, '
+            'last_modified TEXT, '
+            'body_digest TEXT NOT NULL, '
+            'body BLOB NOT NULL, '
+            'encoding TEXT NOT NULL, '
+            'records TEXT NOT NULL, '
+            'config_digest TEXT)')
+        columns = [row[1] for row in
+                   self.connection.execute('PRAGMA table_info(pages)')]
+        if 'config_digest' not in columns:
+            # Cache written before the digest was stored: every page is parsed
+            # again once
+            self.connection.execute(
+                'ALTER TABLE pages ADD COLUMN config_digest TEXT')
+        self.connection.commit()
+        self.nb_uncommitted = 0
+        self.nb_reused = 0
+
+    def get_fingerprint(self, request):
+        # Same fingerprint as the dupefilter, an URL is cached once whatever
+        # its scheme
+        return CustomDupeFilter.compute_fingerprint(request, self.use_anchors,
+                                                    remove_scheme=True)
+
+    @staticmethod
+    def get_body_digest(body):
+        return hashlib.sha1(body).hexdigest()
+
+    @staticmethod
+    def get_config_digest(config_content):
+        """Digest of the settings of the config extracting the records"""
+        settings = {key: value for key, value in config_content.items() if
+                    key not in NON_EXTRACTION_SETTINGS}
+        return hashlib.sha1(json.dumps(settings, sort_keys=True).encode(
+            'utf-8')).hexdigest()
+
+    def get_validators(self, request):
+        """Return the (ETag, Last-Modified) of the cached page, if any"""
+        return self.connection.execute(
+            'SELECT etag, last_modified FROM pages WHERE fingerprint = ?',
+            (self.get_fingerprint(request),)).fetchone()
+
+    def get_cached_response(self, request, response):
+        """Rebuild the cached page answered by a 304 Not Modified response"""
+        row = self.connection.execute(
+            'SELECT body, encoding FROM pages WHERE fingerprint = ?',
+            (self.get_fingerprint(request),)).fetchone()
+        if row is None:
+            return None
+
+        return HtmlResponse(url=response.url, status=200,
+                            headers=response.headers,
+                            body=zlib.decompress(row[0]), encoding=row[1],
+                            request=request, flags=['cached'])
+
+    def get_records(self, response):
+        """
+        Return the records of the page if neither its body nor the config
+        changed
+        """
+        row = self.connection.execute(
+            'SELECT body_digest, config_digest, records FROM pages '
+            'WHERE fingerprint = ?',
+            (self.get_fingerprint(response.request),)).fetchone()
+
+        if row is None or row[0] != self.get_body_digest(response.body) or \
+                row[1] != self.config_digest:
+            return None
+
+        self.nb_reused += 1
+        return json.loads(row[2])
+
+    def store(self, response, records):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO pages (fingerprint, etag, last_modified, '
+            'body_digest, body, encoding, records, config_digest) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (self.get_fingerprint(response.request),
+             self._get_header(response, b'ETag'),
+             self._get_header(response, b'Last-Modified'),
+             self.get_body_digest(response.body),
+             zlib.compress(response.body),
+             response.encoding,
+             json.dumps([Record.as_dict(record) for record in records]),
+             self.config_digest))
+
+        self.nb_uncommitted += 1
+        if self.nb_uncommitted >= COMMIT_EVERY:
+            self.connection.commit()
+            self.nb_uncommitted = 0
+
+    @staticmethod
+    def _get_header(response, name):
+        value = response.headers.get(name)
+        return value.decode('latin-1') if value is not None else None
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()